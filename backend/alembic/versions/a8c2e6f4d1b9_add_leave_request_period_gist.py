@@ -0,0 +1,40 @@
+"""add_leave_request_period_gist
+
+Revision ID: a8c2e6f4d1b9
+Revises: f1b7d4e9a3c2
+Create Date: 2026-10-19 16:02:44.871390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c2e6f4d1b9'
+down_revision: Union[str, None] = 'f1b7d4e9a3c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Postgres only; SQLite keeps using ix_leave_requests_user_start for overlap checks
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # btree_gist lets the GiST index combine uuid equality with range overlap
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE leave_requests ADD COLUMN period daterange "
+        "GENERATED ALWAYS AS (daterange(start_date, end_date, '[]')) STORED"
+    )
+    op.execute("CREATE INDEX ix_leave_requests_user_period ON leave_requests USING gist (user_id, period)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_leave_requests_user_period")
+    op.execute("ALTER TABLE leave_requests DROP COLUMN IF EXISTS period")
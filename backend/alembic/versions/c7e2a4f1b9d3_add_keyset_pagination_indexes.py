@@ -0,0 +1,35 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: c7e2a4f1b9d3
+Revises: b3c1d9e2f4a7
+Create Date: 2026-10-19 11:04:27.551930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a4f1b9d3'
+down_revision: Union[str, None] = 'b3c1d9e2f4a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('leave_requests', schema=None) as batch_op:
+        batch_op.create_index('ix_leave_requests_created_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_leave_requests_user_created_id', ['user_id', 'created_at', 'id'], unique=False)
+
+    # Expression index matching the ORDER BY coalesce(full_name, '') of user lists
+    op.create_index('ix_users_sort_name_id', 'users', [sa.text("coalesce(full_name, '')"), 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_sort_name_id', table_name='users')
+
+    with op.batch_alter_table('leave_requests', schema=None) as batch_op:
+        batch_op.drop_index('ix_leave_requests_user_created_id')
+        batch_op.drop_index('ix_leave_requests_created_id')
@@ -0,0 +1,51 @@
+"""add_leave_request_approver
+
+Revision ID: f1b7d4e9a3c2
+Revises: e5a9c3d7f2b1
+Create Date: 2026-10-19 15:27:10.664182
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b7d4e9a3c2'
+down_revision: Union[str, None] = 'e5a9c3d7f2b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING_WHERE = sa.text("status IN ('pending', 'cancel_pending')")
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('leave_requests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('approver_id', sa.UUID(), nullable=True))
+        batch_op.create_foreign_key('fk_leave_requests_approver_id_users', 'users', ['approver_id'], ['id'])
+
+    # Backfill pending rows from the requester's current supervisor
+    op.execute(
+        "UPDATE leave_requests SET approver_id = "
+        "(SELECT users.supervisor_id FROM users WHERE users.id = leave_requests.user_id) "
+        "WHERE status IN ('pending', 'cancel_pending')"
+    )
+
+    op.create_index(
+        'ix_leave_requests_pending_approver', 'leave_requests', ['approver_id', 'created_at', 'id'],
+        unique=False, postgresql_where=PENDING_WHERE, sqlite_where=PENDING_WHERE
+    )
+    op.create_index(
+        'ix_leave_requests_pending_created', 'leave_requests', ['created_at', 'id'],
+        unique=False, postgresql_where=PENDING_WHERE, sqlite_where=PENDING_WHERE
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_leave_requests_pending_created', table_name='leave_requests')
+    op.drop_index('ix_leave_requests_pending_approver', table_name='leave_requests')
+
+    with op.batch_alter_table('leave_requests', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_leave_requests_approver_id_users', type_='foreignkey')
+        batch_op.drop_column('approver_id')
@@ -1,3 +1,4 @@
+import logging
 import os
 from datetime import datetime, timedelta
 from typing import Optional
@@ -17,6 +18,9 @@ from . import models
 from .billing.manager import SubscriptionManager
 
 from .limiter import limiter # <-- Added
+from .etag import bump_tenant_version
+
+logger = logging.getLogger("offdays")
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -94,7 +98,7 @@ async def download_avatar(url: str, user_id: str) -> Optional[str]:
         from urllib.parse import urlparse
         parsed_url = urlparse(url)
         if not parsed_url.netloc.endswith(".googleusercontent.com"):
-            print(f"Refusing to download avatar from untrusted domain: {parsed_url.netloc}")
+            logger.warning(f"Refusing to download avatar from untrusted domain: {parsed_url.netloc}")
             return None
 
         async with httpx.AsyncClient() as client:
@@ -134,11 +138,11 @@ async def download_avatar(url: str, user_id: str) -> Optional[str]:
                         
                         return blob.public_url
                     except Exception as gcs_err:
-                        print(f"Failed to upload avatar to GCS: {gcs_err}")
+                        logger.warning(f"Failed to upload avatar to GCS: {gcs_err}")
                         return None
 
     except Exception as e:
-        print(f"Failed to download avatar: {e}")
+        logger.warning(f"Failed to download avatar: {e}")
     return None
 
 
@@ -224,6 +228,8 @@ async def callback(
     )
 
     user = None
+    # Cached user lists are only invalidated when something they show changes
+    profile_changed = False
     if oauth:
         user = oauth.user
     else:
@@ -245,6 +251,7 @@ async def callback(
         user = models.User(email=email, full_name=full_name)
         db.add(user)
         db.flush()
+        profile_changed = True
         
         # Link OAuth
         if not oauth:
@@ -285,6 +292,7 @@ async def callback(
         )
 
     # Update picture if we have one
+    previous_picture = user.picture
     if picture_url:
         # Always try to download/update the cached avatar on login
         # This ensures we get updates but also have a local cache
@@ -294,6 +302,8 @@ async def callback(
         elif not user.picture:
             # Fallback to remote URL if download failed and we don't have one
             user.picture = picture_url
+    if user.picture != previous_picture:
+        profile_changed = True
 
     # Make the very first user of THIS TENANT (domain) an admin
     existing_admin = (
@@ -306,6 +316,7 @@ async def callback(
     )
     if existing_admin is None:
         user.is_admin = True
+        profile_changed = True
 
 
 
@@ -314,6 +325,10 @@ async def callback(
     # Update last_login
     user.last_login = datetime.utcnow()
 
+    # Not on every login: that would invalidate every ETag and cached list of
+    # the tenant. Lists may show a stale last_login until the next real change.
+    if profile_changed:
+        bump_tenant_version(db, user_domain)
     db.commit()
     db.refresh(user)
 
@@ -1,33 +1,67 @@
+from typing import Optional
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, Request, status
 import jwt
 from jwt.exceptions import PyJWTError
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, event
 from sqlalchemy.orm import Session
 
 from . import models
 from .config import settings
-from .database import SessionLocal
+from .database import SessionLocal, ReadSessionLocal, engine, read_engine
 from .tenant_resolver import TenantResolver
 
 
-def get_db():
+# Set after a write so the client's next reads skip the (possibly lagging) replica
+READ_PRIMARY_COOKIE = "read_primary"
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+
+def get_db(request: Request):
     db = SessionLocal()
+    if read_engine is not engine:
+        @event.listens_for(db, "after_commit")
+        def _pin_to_primary(session):
+            # ReadPrimaryCookieMiddleware sets the cookie on whatever response the route returns
+            request.state.read_primary = True
     try:
         yield db
     finally:
         db.close()
 
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> models.User:
+def get_read_db(request: Request):
+    """
+    Session for read-only routes. Uses the read replica unless the client
+    wrote recently (cookie) or asks for the primary explicitly (header).
+    Never commit on it.
+    """
+    use_primary = (
+        read_engine is engine
+        or request.cookies.get(READ_PRIMARY_COOKIE)
+        or request.headers.get(READ_PRIMARY_HEADER)
+    )
+    db = SessionLocal() if use_primary else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def token_from_request(request: Request) -> Optional[str]:
+    """JWT from the access_token cookie, or the Authorization: Bearer header."""
     token = request.cookies.get("access_token")
     if not token:
         # Fallback to Authorization header
         auth_header = request.headers.get("Authorization")
         if auth_header and auth_header.startswith("Bearer "):
             token = auth_header.replace("Bearer ", "")
-            
+    return token
+
+
+def _user_id_from_token(request: Request) -> UUID:
+    token = token_from_request(request)
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -53,16 +87,36 @@ def get_current_user(request: Request, db: Session = Depends(get_db)) -> models.
             detail="Invalid token",
         )
 
-    user = db.get(models.User, UUID(user_id))
+    return UUID(user_id)
+
+
+def _active_user(user: Optional[models.User]) -> models.User:
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Inactive user",
         )
-
     return user
 
 
+def get_current_user(request: Request, db: Session = Depends(get_db)) -> models.User:
+    return _active_user(db.get(models.User, _user_id_from_token(request)))
+
+
+def get_current_reader(request: Request, db: Session = Depends(get_read_db)) -> models.User:
+    """
+    get_current_user for read-only routes: looks the user up on the route's
+    read session, so a replica GET doesn't also query the primary. Falls
+    back to the primary for a user the replica hasn't caught up with yet.
+    """
+    user_id = _user_id_from_token(request)
+    user = db.get(models.User, user_id)
+    if user is None and db.get_bind() is read_engine and read_engine is not engine:
+        with SessionLocal() as primary:
+            user = primary.get(models.User, user_id)
+    return _active_user(user)
+
+
 
 def get_current_tenant(
     request: Request,
@@ -120,4 +174,6 @@ def require_admin(current_user: models.User = Depends(get_current_user)) -> mode
     return current_user
 
 
-
+def require_admin_reader(current_user: models.User = Depends(get_current_reader)) -> models.User:
+    """require_admin for read-only routes (see get_current_reader)."""
+    return require_admin(current_user)
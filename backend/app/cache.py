@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .pagination import NEXT_CURSOR_HEADER
+from .invalidation import subscribe
+from .metrics import register_cache
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU with an optional per-entry TTL.
+    Keys are tuples whose second element is the tenant domain,
+    so a tenant's entries can be dropped in one go.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate_tenant(self, domain: str) -> None:
+        with self._lock:
+            for key in [k for k in self._data if isinstance(k, tuple) and len(k) > 1 and k[1] == domain]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+response_cache = LRUCache(maxsize=settings.response_cache_size, ttl=settings.response_cache_ttl)
+register_cache("response", lambda: (response_cache.hits, response_cache.misses))
+
+
+def _on_invalidation(kind: str, key: str) -> None:
+    if kind == "tenant":
+        response_cache.invalidate_tenant(key)
+
+
+subscribe(_on_invalidation)
+
+
+def enable_long_ttl() -> None:
+    """Called once the invalidation bus is listening: remote writes now evict entries."""
+    response_cache.ttl = settings.response_cache_ttl_with_bus
+
+
+def current_tenant_version(request: Request, db: Session, domain: str) -> int:
+    """Tenant version already read by `conditional_get`, or a fresh lookup."""
+    version = getattr(request.state, "tenant_version", None)
+    if version is None:
+        from .etag import get_tenant_version
+        version = get_tenant_version(db, domain)
+    return version
+
+
+def cached_json_response(key: tuple, response: Response, build: Callable[[], Response]) -> Response:
+    """
+    Serve a rendered JSON body from `response_cache`, or build and store it.
+    `key` must start with (scope, domain, tenant_version, ...).
+    Headers set on the injected `response` (ETag, ...) are applied to cache hits too.
+    """
+    hit = response_cache.get(key)
+    if hit is None:
+        built = build()
+        extra = {}
+        if NEXT_CURSOR_HEADER.lower() in built.headers:
+            extra[NEXT_CURSOR_HEADER] = built.headers[NEXT_CURSOR_HEADER.lower()]
+        response_cache.set(key, (built.body, extra))
+        return built
+
+    body, extra = hit
+    headers = dict(response.headers)
+    headers.update(extra)
+    return Response(content=body, media_type="application/json", headers=headers)
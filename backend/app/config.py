@@ -32,6 +32,53 @@ class Settings(BaseModel):
     smtp_password: str = os.getenv("SMTP_PASSWORD", "")
     emails_from_email: str = os.getenv("EMAILS_FROM_EMAIL", "noreply@offdays.app")
 
+    # Connection pool (per instance; Cloud SQL limits apply across all instances)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    # Postgres statement_timeout in milliseconds (0 = no limit)
+    db_statement_timeout_ms: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+    # Bearer token required by GET /metrics and /health/db (empty = both disabled, answer 404)
+    metrics_token: str = os.getenv("METRICS_TOKEN", "")
+    # Tracing: "" (off), "memory", "file" (JSON lines in TRACING_FILE) or "otlp" (OTLP/HTTP JSON)
+    tracing_exporter: str = os.getenv("TRACING_EXPORTER", "").lower()
+    tracing_sample_rate: float = float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+    tracing_file: str = os.getenv("TRACING_FILE", "traces.jsonl")
+    tracing_otlp_endpoint: str = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318")
+    # JSON log lines (Cloud Logging); plain text locally unless LOG_JSON=true
+    log_json: bool = os.getenv("LOG_JSON", "true" if os.getenv("K_SERVICE") else "false").lower() == "true"
+    # Fraction of health-probe requests that are logged (0 = silent)
+    health_log_sample_rate: float = float(os.getenv("HEALTH_LOG_SAMPLE_RATE", "0.01"))
+    # Admin profiling: X-Profile: cprofile header, /admin/profiling (tracemalloc, loop lag)
+    profiling_enabled: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    # Token-bucket limits on heavy endpoints (app.rate_limit); "memory" or "database" buckets
+    rate_limit_enabled: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    rate_limit_storage: str = os.getenv(
+        "RATE_LIMIT_STORAGE",
+        "database" if os.getenv("DATABASE_URL", "").startswith("postgresql") else "memory",
+    ).lower()
+    # Proxies that append to X-Forwarded-For (1 = Cloud Run front end, 2 = behind a load balancer too)
+    forwarded_proxy_hops: int = int(os.getenv("FORWARDED_PROXY_HOPS", "1"))
+    # Per-request SQL profiler (query count, DB time, N+1 detection); off by default
+    query_profiler: bool = os.getenv("QUERY_PROFILER", "false").lower() == "true"
+    # A statement repeated this many times in one request is reported as N+1
+    query_profiler_repeat_threshold: int = int(os.getenv("QUERY_PROFILER_REPEAT_THRESHOLD", "5"))
+
+    # In-process response cache (tenant-wide reads, keyed by tenant version)
+    response_cache_size: int = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+    response_cache_ttl: float = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+    # Postgres LISTEN/NOTIFY invalidation between instances; caches can then keep entries longer
+    invalidation_bus: bool = os.getenv("INVALIDATION_BUS", "true").lower() == "true"
+    response_cache_ttl_with_bus: float = float(os.getenv("RESPONSE_CACHE_TTL_WITH_BUS", "3600"))
+    # Optional read replica for read-only GET routes (falls back to the primary when unset)
+    database_replica_url: str = os.getenv("DATABASE_REPLICA_URL", "")
+    # After a write, the same client reads from the primary for this long (read-your-writes)
+    replica_read_your_writes_seconds: int = int(os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", "10"))
+    # Leave requests of the current and previous (N-1) years stay in the hot table
+    archive_keep_years: int = int(os.getenv("ARCHIVE_KEEP_YEARS", "2"))
+
 
     # Cookie security
     # Default to False in dev (detected by lack of K_SERVICE), True in Cloud Run
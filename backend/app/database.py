@@ -2,15 +2,46 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 from .config import settings
+from .db_metrics import InstrumentedQueuePool, instrument
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-)
+def _engine_options(url: str) -> dict:
+    """Pool sizing and timeouts from settings. SQLite keeps SQLAlchemy's default pool."""
+    options = {"pool_pre_ping": True}
+    if url.startswith("sqlite"):
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    if url.startswith("postgresql") and settings.db_statement_timeout_ms > 0:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={settings.db_statement_timeout_ms}"
+        }
+    return options
+
+
+engine = create_engine(settings.database_url, **_engine_options(settings.database_url))
+instrument(engine)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+# Read replica for read-only routes; without DATABASE_REPLICA_URL it is the primary itself
+if settings.database_replica_url:
+    read_engine = create_engine(
+        settings.database_replica_url,
+        **_engine_options(settings.database_replica_url),
+    )
+    instrument(read_engine, "replica")
+else:
+    read_engine = engine
+
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False)
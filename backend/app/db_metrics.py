@@ -0,0 +1,179 @@
+"""
+Connection-pool metrics: checked-out / overflow gauges and how long requests
+wait for a connection. Meant for sizing pool_size / max_overflow from real data.
+"""
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from .metrics import DB_QUERIES, DB_QUERY_DURATION, register_collector, sample_lines
+
+# Upper bounds (seconds) of the wait-time histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+
+class PoolMetrics:
+    """Counters for one pool; updated from pool events, read with `pool_snapshot()`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.wait_buckets = [0] * len(WAIT_BUCKETS)
+
+    def observe_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+            if timed_out:
+                self.timeouts += 1
+
+    def count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long each checkout waits for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.observe_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.observe_wait(time.perf_counter() - started)
+        return conn
+
+    def recreate(self):
+        # pool_pre_ping / dispose() build a fresh pool; keep the counters
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+# Metrics per instrumented engine (primary, replica)
+_ENGINE_METRICS: Dict[Engine, PoolMetrics] = {}
+_ENGINE_NAMES: Dict[str, Engine] = {}
+
+
+def instrument(engine: Engine, name: str = "primary") -> PoolMetrics:
+    """Count checkouts and new connections of `engine`'s pool."""
+    metrics = getattr(engine.pool, "metrics", None) or PoolMetrics()
+    _ENGINE_METRICS[engine] = metrics
+    _ENGINE_NAMES[name] = engine
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.count("checkouts")
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.count("connects")
+
+    return metrics
+
+
+def pool_snapshot(engine: Engine) -> Dict:
+    """Current gauges and cumulative counters of `engine`'s pool."""
+    pool = engine.pool
+    metrics = _ENGINE_METRICS.get(engine) or PoolMetrics()
+    snapshot = {
+        "pool_class": type(pool).__name__,
+        "checkouts": metrics.checkouts,
+        "connects": metrics.connects,
+        "timeouts": metrics.timeouts,
+        "wait": {
+            "count": metrics.wait_count,
+            "sum_seconds": round(metrics.wait_sum, 6),
+            "max_seconds": round(metrics.wait_max, 6),
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): n
+                for bound, n in zip(WAIT_BUCKETS, metrics.wait_buckets)
+            },
+        },
+    }
+    if isinstance(pool, QueuePool):
+        snapshot.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    return snapshot
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_metrics_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_metrics_start")
+    if starts:
+        DB_QUERIES.inc()
+        DB_QUERY_DURATION.observe(time.perf_counter() - starts.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute; still count them and drop their start
+    conn = exception_context.connection
+    starts = conn.info.get("query_metrics_start") if conn is not None else None
+    if starts:
+        DB_QUERIES.inc()
+        DB_QUERY_DURATION.observe(time.perf_counter() - starts.pop())
+
+
+def _collect_pools() -> List[str]:
+    snapshots = {name: pool_snapshot(engine) for name, engine in _ENGINE_NAMES.items()}
+    lines = []
+    for field, kind, doc in (
+        ("checked_out", "gauge", "Connections currently checked out."),
+        ("overflow", "gauge", "Connections open beyond pool_size."),
+        ("size", "gauge", "Configured pool_size."),
+        ("checkouts", "counter", "Connection checkouts."),
+        ("connects", "counter", "New DBAPI connections opened."),
+        ("timeouts", "counter", "Checkouts that hit pool_timeout."),
+    ):
+        suffix = "_total" if kind == "counter" else ""
+        lines += sample_lines(
+            f"offdays_db_pool_{field}{suffix}", doc, kind,
+            [({"engine": name}, snap[field]) for name, snap in snapshots.items() if field in snap],
+        )
+
+    name = "offdays_db_pool_wait_seconds"
+    lines += [f"# HELP {name} Time spent waiting for a pooled connection.", f"# TYPE {name} histogram"]
+    for engine_name, snap in snapshots.items():
+        wait = snap["wait"]
+        cumulative = 0
+        for bound, n in wait["buckets"].items():
+            cumulative += n
+            lines.append(f'{name}_bucket{{engine="{engine_name}",le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{engine="{engine_name}"}} {wait["sum_seconds"]}')
+        lines.append(f'{name}_count{{engine="{engine_name}"}} {wait["count"]}')
+    return lines
+
+
+register_collector(_collect_pools)
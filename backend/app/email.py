@@ -1,13 +1,18 @@
+import logging
 import aiosmtplib
 from email.message import EmailMessage
 from app.config import settings
+from app.metrics import SMTP_ERRORS, SMTP_SEND_DURATION
+from app.tracing import span
+
+logger = logging.getLogger("offdays")
 
 async def send_email(to_email: str, subject: str, content: str):
     """
     Send an email asynchronously using SMTP settings from config.
     """
     if not settings.smtp_host or not settings.smtp_port:
-        print(f"⚠️ SMTP not configured. Skipping email to {to_email}")
+        logger.warning(f"⚠️ SMTP not configured. Skipping email to {to_email}")
         return
 
     message = EmailMessage()
@@ -17,18 +22,20 @@ async def send_email(to_email: str, subject: str, content: str):
     message.set_content(content)
 
     try:
-        await aiosmtplib.send(
-            message,
-            hostname=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_user,
-            password=settings.smtp_password,
-            use_tls=True if settings.smtp_port == 465 else False,
-            start_tls=True if settings.smtp_port == 587 else False,
-        )
-        print(f"📧 Email sent to {to_email}: {subject}")
+        with span("smtp.send", **{"smtp.host": settings.smtp_host}), SMTP_SEND_DURATION.time():
+            await aiosmtplib.send(
+                message,
+                hostname=settings.smtp_host,
+                port=settings.smtp_port,
+                username=settings.smtp_user,
+                password=settings.smtp_password,
+                use_tls=True if settings.smtp_port == 465 else False,
+                start_tls=True if settings.smtp_port == 587 else False,
+            )
+        logger.info(f"📧 Email sent to {to_email}: {subject}")
     except Exception as e:
-        print(f"❌ Failed to send email to {to_email}: {e}")
+        SMTP_ERRORS.inc()
+        logger.error(f"❌ Failed to send email to {to_email}: {e}")
 
 async def send_new_request_email(to_email: str, requester_name: str, start_date: str, end_date: str, days: float):
     subject = f"New Leave Request: {requester_name}"
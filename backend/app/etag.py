@@ -0,0 +1,73 @@
+import hashlib
+from datetime import date
+from typing import Any, Callable, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .auth_deps import get_read_db, get_current_reader
+from .invalidation import publish
+
+
+def bump_tenant_version(db: Session, domain: str) -> None:
+    """
+    Invalidate cached reads of a tenant. Call from write paths before `db.commit()`,
+    so the bump is part of the same transaction as the change.
+    """
+    db.execute(
+        update(models.Tenant)
+        .where(models.Tenant.domain == domain)
+        .values(data_version=models.Tenant.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    # Entries keyed by the old version are unreachable anyway; free them now,
+    # here and (on commit) on every other instance
+    publish(db, "tenant", domain)
+
+
+def get_tenant_version(db: Session, domain: str) -> int:
+    return db.scalar(select(models.Tenant.data_version).where(models.Tenant.domain == domain)) or 0
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def conditional_get(scope: str, state: Optional[Callable[[Session, str], Any]] = None):
+    """
+    Dependency factory for ETag / If-None-Match on tenant-scoped reads.
+
+    The ETag is derived from the tenant version counter, the caller (identity and
+    admin flag), the query string and today's date (for "current year/month" defaults).
+    `state(db, domain)`, if given, adds data the route depends on that can change
+    without a version bump (e.g. a trial running out). On a match it answers 304
+    before the route runs its heavy queries.
+    """
+    def dependency(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_read_db),
+        current_user: models.User = Depends(get_current_reader),
+    ) -> str:
+        domain = current_user.email.split("@")[-1]
+        version = get_tenant_version(db, domain)
+        request.state.tenant_version = version
+        params = sorted(request.query_params.multi_items())
+        extra = state(db, domain) if state is not None else None
+        raw = f"{scope}|{domain}|{version}|{current_user.id}|{current_user.is_admin}|{date.today()}|{params}|{extra}"
+        etag = f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:24]}"'
+
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
+        # Let the browser cache but always revalidate
+        response.headers["Cache-Control"] = "private, no-cache"
+        return etag
+
+    return dependency
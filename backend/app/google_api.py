@@ -1,13 +1,30 @@
+import logging
 import httpx
+from contextlib import contextmanager
 from time import time
 from typing import List, Dict, Any
 from sqlalchemy.orm import Session
 from .config import settings
 from .models import OAuthAccount
+from .metrics import GOOGLE_API_ERRORS, register_cache, track_google_call
+from .tracing import span
 from google.oauth2 import service_account
 from google.auth.transport.requests import Request as GoogleRequest
 
+logger = logging.getLogger("offdays")
+
 _sa_token_cache = {"token": None, "expiry": 0}
+# hits / misses of the service-account token cache and of still-valid user tokens
+_token_stats = {"sa_hits": 0, "sa_misses": 0, "oauth_hits": 0, "oauth_misses": 0}
+register_cache("service_account_token", lambda: (_token_stats["sa_hits"], _token_stats["sa_misses"]))
+register_cache("oauth_token", lambda: (_token_stats["oauth_hits"], _token_stats["oauth_misses"]))
+
+@contextmanager
+def _google_call(operation: str):
+    """Span + latency/error metrics around one Google API call."""
+    with span(f"google.{operation}"), track_google_call(operation):
+        yield
+
 
 def get_service_account_token(scopes: List[str]) -> str:
     """
@@ -16,7 +33,9 @@ def get_service_account_token(scopes: List[str]) -> str:
     """
     now = int(time())
     if _sa_token_cache["token"] and _sa_token_cache["expiry"] > now + 60:
+        _token_stats["sa_hits"] += 1
         return _sa_token_cache["token"]
+    _token_stats["sa_misses"] += 1
 
     try:
         creds = service_account.Credentials.from_service_account_file(
@@ -24,14 +43,15 @@ def get_service_account_token(scopes: List[str]) -> str:
             scopes=scopes
         )
         # Refresh to get access token
-        creds.refresh(GoogleRequest())
+        with _google_call("service_account_token"):
+            creds.refresh(GoogleRequest())
         
         _sa_token_cache["token"] = creds.token
         _sa_token_cache["expiry"] = int(creds.expiry.timestamp()) if creds.expiry else now + 3600
         
         return creds.token
     except Exception as e:
-        print(f"Failed to get service account token: {e}")
+        logger.error(f"Failed to get service account token: {e}")
         raise e
 
 async def refresh_google_token(db: Session, oauth: OAuthAccount) -> str:
@@ -41,25 +61,29 @@ async def refresh_google_token(db: Session, oauth: OAuthAccount) -> str:
     """
     # If token is still valid (with 60sec buffer), return it
     if oauth.expires_at and oauth.expires_at > int(time()) + 60:
+        _token_stats["oauth_hits"] += 1
         return oauth.access_token
+    _token_stats["oauth_misses"] += 1
     
     if not oauth.refresh_token:
         raise ValueError("No refresh token available. User must log in again to grant offline access.")
     
     token_url = "https://oauth2.googleapis.com/token"
     async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            token_url,
-            data={
-                "client_id": settings.google_client_id,
-                "client_secret": settings.google_client_secret,
-                "refresh_token": oauth.refresh_token,
-                "grant_type": "refresh_token",
-            },
-        )
+        with _google_call("token_refresh"):
+            resp = await client.post(
+                token_url,
+                data={
+                    "client_id": settings.google_client_id,
+                    "client_secret": settings.google_client_secret,
+                    "refresh_token": oauth.refresh_token,
+                    "grant_type": "refresh_token",
+                },
+            )
         
         if resp.status_code != 200:
-            print(f"Failed to refresh token: {resp.text}")
+            GOOGLE_API_ERRORS.inc(operation="token_refresh")
+            logger.warning(f"Failed to refresh token: {resp.text}")
             raise ValueError("Token refresh failed. User must log in again.")
             
         data = resp.json()
@@ -90,14 +114,16 @@ async def search_google_users(access_token: str, query: str) -> List[Dict[str, A
     }
     
     async with httpx.AsyncClient() as client:
-        resp = await client.get(
-            url,
-            params=params,
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+        with _google_call("people_search"):
+            resp = await client.get(
+                url,
+                params=params,
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
         
         if resp.status_code != 200:
-            print(f"Google People API Error: {resp.text}")
+            GOOGLE_API_ERRORS.inc(operation="people_search")
+            logger.warning(f"Google People API Error: {resp.text}")
             return []
             
         data = resp.json()
@@ -151,19 +177,21 @@ async def create_calendar_event(access_token: str, summary: str, start_date: str
     }
     
     async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            url,
-            json=event_body,
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+        with _google_call("calendar_create"):
+            resp = await client.post(
+                url,
+                json=event_body,
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
         
         if resp.status_code < 200 or resp.status_code >= 300:
+            GOOGLE_API_ERRORS.inc(operation="calendar_create")
             error_detail = resp.text
             try:
                 error_json = resp.json()
                 error_detail = error_json.get("error", {}).get("message", resp.text)
             except: pass
-            print(f"Failed to create Google Calendar event: {error_detail}")
+            logger.error(f"Failed to create Google Calendar event: {error_detail}")
             raise ValueError(f"Google Calendar API Error: {error_detail}")
             
         data = resp.json()
@@ -176,10 +204,12 @@ async def delete_calendar_event(access_token: str, event_id: str, calendar_id: s
     url = f"https://www.googleapis.com/calendar/v3/calendars/{calendar_id}/events/{event_id}"
     
     async with httpx.AsyncClient() as client:
-        resp = await client.delete(
-            url,
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+        with _google_call("calendar_delete"):
+            resp = await client.delete(
+                url,
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
         if resp.status_code != 204 and resp.status_code != 404:
-             print(f"Failed to delete Google Calendar event: {resp.text}")
+             GOOGLE_API_ERRORS.inc(operation="calendar_delete")
+             logger.warning(f"Failed to delete Google Calendar event: {resp.text}")
              # Not raising error to avoid blocking logic if event is already gone
@@ -0,0 +1,131 @@
+"""
+Cross-instance cache invalidation.
+
+Writers publish small events such as ("tenant", <domain>) with Postgres NOTIFY
+inside their transaction, so they are only delivered on commit. Every
+instance runs one listener thread on a dedicated connection and fans the
+events out to local subscribers (e.g. the response cache).
+
+The bus is not what keeps caches correct: cached entries are keyed by the
+tenant's `data_version`, which writers bump in the database, so a stale entry
+is never served once the new version is read. Events only free those entries
+early, which is what lets caches use the long RESPONSE_CACHE_TTL_WITH_BUS.
+
+On SQLite (local dev, single process) there is no bus: events are applied
+locally only and caches rely on their TTL.
+"""
+import json
+import logging
+import threading
+from typing import Callable, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from .config import settings
+
+logger = logging.getLogger("offdays")
+
+CHANNEL = "offdays_invalidate"
+
+_subscribers: List[Callable[[str, str], None]] = []
+_listener: "InvalidationListener | None" = None
+
+
+def bus_supported() -> bool:
+    return settings.invalidation_bus and settings.database_url.startswith("postgresql")
+
+
+def is_listening() -> bool:
+    return _listener is not None and _listener.is_alive()
+
+
+def subscribe(handler: Callable[[str, str], None]) -> None:
+    """Register `handler(kind, key)` to be called for every invalidation event."""
+    _subscribers.append(handler)
+
+
+def _dispatch(kind: str, key: str) -> None:
+    for handler in list(_subscribers):
+        try:
+            handler(kind, key)
+        except Exception as e:
+            logger.error(f"Invalidation handler failed for {kind}:{key}: {e}", exc_info=True)
+
+
+def publish(db: Session, kind: str, key: str) -> None:
+    """
+    Announce that cached data for `kind`/`key` is stale.
+    Local subscribers are notified right away; other instances on commit via NOTIFY.
+    """
+    _dispatch(kind, key)
+    if bus_supported():
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CHANNEL, "payload": json.dumps({"kind": kind, "key": key})}
+        )
+
+
+class InvalidationListener(threading.Thread):
+    """LISTEN loop on its own psycopg connection, reconnecting with backoff."""
+
+    def __init__(self, dsn: str):
+        super().__init__(name="offdays-invalidation", daemon=True)
+        self.dsn = dsn
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        import select
+        import psycopg
+
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            try:
+                with psycopg.connect(self.dsn, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {CHANNEL}")
+                    logger.info("📡 Listening for cache invalidations")
+                    backoff = 1.0
+                    pgconn = conn.pgconn
+                    while not self._stop_event.is_set():
+                        # Poll the socket with a timeout so stop() is honoured
+                        ready, _, _ = select.select([conn.fileno()], [], [], 5.0)
+                        if not ready:
+                            continue
+                        pgconn.consume_input()
+                        while (notify := pgconn.notifies()) is not None:
+                            payload = notify.extra.decode()
+                            try:
+                                event = json.loads(payload)
+                                _dispatch(event["kind"], event["key"])
+                            except (ValueError, KeyError):
+                                logger.warning(f"Ignoring malformed invalidation event: {payload!r}")
+            except Exception as e:
+                logger.error(f"Invalidation listener error, reconnecting in {backoff:.0f}s: {e}")
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+
+def start_listener() -> bool:
+    """Start the listener thread if the database supports it. Returns True when listening."""
+    global _listener
+    if not bus_supported():
+        logger.info("Cache invalidation bus disabled, caches run in TTL-only mode")
+        return False
+    if is_listening():
+        return True
+
+    url = make_url(settings.database_url).set(drivername="postgresql")
+    _listener = InvalidationListener(url.render_as_string(hide_password=False))
+    _listener.start()
+    return True
+
+
+def stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
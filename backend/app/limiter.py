@@ -1,4 +1,20 @@
 from slowapi import Limiter
-from slowapi.util import get_remote_address
+from starlette.requests import Request
 
-limiter = Limiter(key_func=get_remote_address)
+from app.config import settings
+
+
+def client_ip(request: Request) -> str:
+    """
+    Client address as seen by the outermost trusted proxy. Cloud Run's front end
+    appends the real client to X-Forwarded-For, so count hops from the right.
+    """
+    forwarded = request.headers.get("X-Forwarded-For")
+    if forwarded:
+        hops = [h.strip() for h in forwarded.split(",") if h.strip()]
+        if hops:
+            return hops[-min(settings.forwarded_proxy_hops, len(hops))]
+    return request.client.host if request.client else "unknown"
+
+
+limiter = Limiter(key_func=client_ip)
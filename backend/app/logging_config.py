@@ -0,0 +1,131 @@
+"""
+Logging pipeline: records are put on a queue by a QueueHandler and written to
+stdout by a QueueListener thread, so request handlers and the event loop never
+block on log I/O. On Cloud Run lines are JSON (severity/message/...), which
+Cloud Logging parses into structured entries.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.config import settings
+
+# Paths hit by Cloud Run / load-balancer probes
+HEALTH_PATHS = ("/",)
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the fields Cloud Logging understands."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "severity": record.levelname,
+            "message": record.getMessage(),
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "logger": record.name,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["stack_trace"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        stack_trace = getattr(record, "stack_trace", None)
+        return f"{text}\n{stack_trace}" if stack_trace else text
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Like QueueHandler, but keeps the traceback as a field instead of folding it into the message."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.exc_info:
+            record.stack_trace = logging.Formatter().formatException(record.exc_info)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        return record
+
+
+class _TraceContextFilter(logging.Filter):
+    """Attach the current trace id (if the request is traced) to each record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        from app.tracing import current_span
+
+        span = current_span()
+        if span is not None:
+            record.trace_id = span.trace_id
+        return True
+
+
+class HealthProbeFilter(logging.Filter):
+    """Keep only a `settings.health_log_sample_rate` fraction of health-probe access logs."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # uvicorn.access args: (client, method, path, http_version, status)
+        args = record.args
+        if isinstance(args, tuple) and len(args) >= 3 and args[2] in HEALTH_PATHS:
+            return random.random() < settings.health_log_sample_rate
+        return True
+
+
+def should_log_health_probe() -> bool:
+    return random.random() < settings.health_log_sample_rate
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Route the root logger through a queue; safe to call more than once."""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    if settings.log_json:
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(_TextFormatter("%(levelname)s: %(message)s"))
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    queue_handler = _QueueHandler(log_queue)
+    # Runs in the caller's context, before the hand-off, so the trace id is still visible
+    queue_handler.addFilter(_TraceContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    logging.getLogger("uvicorn.access").addFilter(HealthProbeFilter())
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records (shutdown)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,83 @@
+from datetime import date, datetime
+from typing import Optional, Sequence
+
+from app.models import UserType
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def compute_accruals(
+    total_days: Sequence[float],
+    year: int,
+    now: Optional[datetime] = None,
+    user_types: Optional[Sequence[Optional[str]]] = None,
+    join_dates: Optional[Sequence[Optional[date]]] = None
+) -> list[float]:
+    """
+    Pro-rated accrual for many entitlements of the same year at once.
+
+    Year boundaries and elapsed days are computed once for the whole batch,
+    each entitlement then costs a couple of float operations.
+
+    - Future years accrue nothing, past years accrue the full total.
+    - Contractors (UserType.CONTRACTOR) do not accrue vacation.
+    - If a join date falls into the year, accrual only starts on that day.
+    """
+    now = now or datetime.utcnow()
+    today = now.date()
+    count = len(total_days)
+    user_types = user_types if user_types is not None else [None] * count
+    join_dates = join_dates if join_dates is not None else [None] * count
+
+    start_of_year = date(year, 1, 1)
+    end_of_year = date(year, 12, 31)
+    days_in_year = (end_of_year - start_of_year).days + 1
+
+    if year > today.year:
+        period_end = None
+    elif year < today.year:
+        period_end = end_of_year
+    else:
+        period_end = today
+
+    results = []
+    for total, user_type, joined in zip(total_days, user_types, join_dates):
+        if period_end is None or user_type == UserType.CONTRACTOR:
+            results.append(0.0)
+            continue
+
+        joined = _as_date(joined)
+        if joined is None or joined <= start_of_year:
+            if year < today.year:
+                # Full past year, keep the contractual total as-is
+                results.append(total)
+                continue
+            accrual_start = start_of_year
+        else:
+            accrual_start = joined
+
+        if accrual_start > period_end:
+            results.append(0.0)
+            continue
+
+        days_elapsed = (period_end - accrual_start).days + 1
+        results.append(round((days_elapsed / days_in_year) * total, 1))
+
+    return results
+
+
+def compute_accrual(
+    total_days: float,
+    year: int,
+    now: Optional[datetime] = None,
+    user_type: Optional[str] = None,
+    join_date: Optional[date] = None
+) -> float:
+    """Single-entitlement variant of `compute_accruals`."""
+    return compute_accruals([total_days], year, now, [user_type], [join_date])[0]
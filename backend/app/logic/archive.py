@@ -0,0 +1,114 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select, insert, delete, func, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import ClauseAdapter
+
+from app.config import settings
+from app.models import LeaveRequest, LeaveRequestArchive, PENDING_APPROVAL_STATUSES
+
+_COLUMNS = [c.name for c in LeaveRequest.__table__.c]
+
+# Hot and archived rows with LeaveRequest's columns, in the same order
+_ALL_LEAVE_REQUESTS = union_all(
+    select(*[LeaveRequest.__table__.c[name] for name in _COLUMNS]),
+    select(*[LeaveRequestArchive.__table__.c[name] for name in _COLUMNS]),
+).subquery("leave_requests_all")
+_TO_ALL = ClauseAdapter(_ALL_LEAVE_REQUESTS)
+
+
+def archive_horizon(db: Session) -> Optional[date]:
+    """Last day covered by the archive (None if it is empty). One index lookup."""
+    return db.scalar(select(func.max(LeaveRequestArchive.end_date)))
+
+
+def reaches_archive(db: Session, since: Optional[date]) -> bool:
+    """Whether rows from `since` on (None = whole history) can be in the archive."""
+    horizon = archive_horizon(db)
+    return horizon is not None and (since is None or since <= horizon)
+
+
+def with_archive(query):
+    """A Core select over `leave_requests` rewritten to read hot + archived rows."""
+    return _TO_ALL.traverse(query)
+
+
+def route_leave_query(db: Session, query, since: Optional[date] = None):
+    """
+    Point a Core select over `leave_requests` at hot + archived rows when it needs them.
+
+    `since` is the earliest date the query can match (None = whole history).
+    Queries that start after the archive horizon are returned unchanged and
+    only touch the hot table.
+    """
+    if not reaches_archive(db, since):
+        return query
+    return with_archive(query)
+
+
+def route_leave_entities(db: Session, query, since: Optional[date] = None):
+    """Same as `route_leave_query` for `select(LeaveRequest)`; still yields LeaveRequest objects."""
+    if not reaches_archive(db, since):
+        return query
+    return select(LeaveRequest).from_statement(with_archive(query))
+
+
+def archive_closed_years(db: Session, before_year: Optional[int] = None, batch_size: int = 1000) -> int:
+    """
+    Move leave requests that ended before `before_year` into the archive, in batches.
+    Requests still awaiting approval stay in the hot table.
+    Defaults to keeping `settings.archive_keep_years` years hot. Returns the number moved.
+    """
+    if before_year is None:
+        before_year = date.today().year - settings.archive_keep_years + 1
+    cutoff = date(before_year, 1, 1)
+
+    moved = 0
+    while True:
+        ids = list(db.scalars(
+            select(LeaveRequest.id)
+            .where(
+                LeaveRequest.end_date < cutoff,
+                LeaveRequest.status.not_in(PENDING_APPROVAL_STATUSES)
+            )
+            .order_by(LeaveRequest.id)
+            .limit(batch_size)
+        ).all())
+        if not ids:
+            break
+
+        db.execute(
+            insert(LeaveRequestArchive).from_select(
+                _COLUMNS,
+                select(*[LeaveRequest.__table__.c[name] for name in _COLUMNS]).where(LeaveRequest.id.in_(ids))
+            )
+        )
+        db.execute(
+            delete(LeaveRequest)
+            .where(LeaveRequest.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        moved += len(ids)
+
+    return moved
+
+
+if __name__ == "__main__":
+    # Nightly / yearly job: python -m app.logic.archive [--before-year 2025]
+    import argparse
+
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Move closed-year leave requests to the archive table")
+    parser.add_argument("--before-year", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        moved = archive_closed_years(db, before_year=args.before_year, batch_size=args.batch_size)
+        print(f"✅ Archived {moved} leave requests")
+    finally:
+        db.close()
@@ -0,0 +1,120 @@
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select, insert, delete, exists, func, literal
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.models import User, UserHierarchy
+
+# Guards the recursive rebuild against cycles already present in supervisor_id
+MAX_DEPTH = 64
+
+
+def subtree_user_ids(manager_id: UUID) -> Select:
+    """Ids of everyone below `manager_id` (direct and indirect reports), for use in `.in_()`."""
+    return select(UserHierarchy.descendant_id).where(UserHierarchy.ancestor_id == manager_id)
+
+
+def is_manager_of(db: Session, manager_id: UUID, user_id: UUID) -> bool:
+    """True if `manager_id` is a direct or indirect supervisor of `user_id`."""
+    return db.scalar(
+        select(exists().where(
+            UserHierarchy.ancestor_id == manager_id,
+            UserHierarchy.descendant_id == user_id
+        ))
+    )
+
+
+def would_create_cycle(db: Session, user_id: UUID, supervisor_id: Optional[UUID]) -> bool:
+    """Making `supervisor_id` the supervisor of `user_id` would close a loop."""
+    if supervisor_id is None:
+        return False
+    return supervisor_id == user_id or is_manager_of(db, user_id, supervisor_id)
+
+
+def set_supervisor(db: Session, user: User, supervisor_id: Optional[UUID]) -> None:
+    """
+    Re-parent `user` (and their whole subtree) under `supervisor_id`, keeping the
+    closure table in sync. Call `would_create_cycle` first; does not commit.
+    """
+    subtree = [(user.id, 0)] + [
+        (row.descendant_id, row.depth)
+        for row in db.execute(
+            select(UserHierarchy.descendant_id, UserHierarchy.depth)
+            .where(UserHierarchy.ancestor_id == user.id)
+        )
+    ]
+    subtree_ids = [descendant_id for descendant_id, _ in subtree]
+
+    # 1. Detach the subtree from its current ancestors (links inside the subtree stay)
+    db.execute(
+        delete(UserHierarchy)
+        .where(
+            UserHierarchy.descendant_id.in_(subtree_ids),
+            UserHierarchy.ancestor_id.not_in(subtree_ids)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    # 2. Attach it below the new supervisor and all of their ancestors
+    if supervisor_id is not None:
+        ancestors = [(supervisor_id, 0)] + [
+            (row.ancestor_id, row.depth)
+            for row in db.execute(
+                select(UserHierarchy.ancestor_id, UserHierarchy.depth)
+                .where(UserHierarchy.descendant_id == supervisor_id)
+            )
+        ]
+        db.execute(
+            insert(UserHierarchy),
+            [
+                {"ancestor_id": ancestor_id, "descendant_id": descendant_id, "depth": up + down + 1}
+                for ancestor_id, up in ancestors
+                for descendant_id, down in subtree
+            ]
+        )
+
+    user.supervisor_id = supervisor_id
+
+
+def rebuild_hierarchy(db: Session) -> int:
+    """Recompute the whole closure table from users.supervisor_id. Returns the number of rows."""
+    tree = (
+        select(
+            User.supervisor_id.label("ancestor_id"),
+            User.id.label("descendant_id"),
+            literal(1).label("depth")
+        )
+        .where(User.supervisor_id.is_not(None))
+        .cte("tree", recursive=True)
+    )
+    parent = User.__table__.alias("parent")
+    tree = tree.union_all(
+        select(parent.c.supervisor_id, tree.c.descendant_id, tree.c.depth + 1)
+        .join(tree, tree.c.ancestor_id == parent.c.id)
+        .where(parent.c.supervisor_id.is_not(None), tree.c.depth < MAX_DEPTH)
+    )
+
+    db.execute(delete(UserHierarchy))
+    db.execute(
+        insert(UserHierarchy).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(tree.c.ancestor_id, tree.c.descendant_id, func.min(tree.c.depth))
+            .where(tree.c.ancestor_id != tree.c.descendant_id)
+            .group_by(tree.c.ancestor_id, tree.c.descendant_id)
+        )
+    )
+    db.commit()
+    return db.scalar(select(func.count()).select_from(UserHierarchy))
+
+
+if __name__ == "__main__":
+    # Backfill / repair: python -m app.logic.hierarchy
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        print(f"✅ Rebuilt user hierarchy: {rebuild_hierarchy(db)} rows")
+    finally:
+        db.close()
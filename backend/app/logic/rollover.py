@@ -0,0 +1,160 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import select, insert, func, case, literal, and_, exists
+from sqlalchemy.orm import Session, aliased
+
+from app.models import Tenant, User, LeaveEntitlement, LeaveRequest, LeaveStatus
+
+
+def _missing_user_ids(db: Session, domain: str, year: int, batch_size: int) -> list:
+    """
+    Next batch of active tenant users that have no entitlement for `year` yet.
+    Recomputed on every call, so an interrupted run simply picks up where it stopped.
+    """
+    has_entitlement = exists().where(
+        LeaveEntitlement.user_id == User.id,
+        LeaveEntitlement.year == year
+    )
+    return list(db.scalars(
+        select(User.id)
+        .where(
+            User.email.like(f"%@{domain}"),
+            User.is_active.is_(True),
+            ~has_entitlement
+        )
+        .order_by(User.id)
+        .limit(batch_size)
+    ).all())
+
+
+def rollover_tenant(
+    db: Session,
+    tenant: Tenant,
+    year: int,
+    carry_over_max: Optional[float] = None,
+    batch_size: int = 500
+) -> int:
+    """
+    Create `year` entitlements for every active user of a tenant in set-based batches.
+
+    total_days = tenant default (+ carried over remaining_days from the previous year,
+    capped at `carry_over_max`; no carry-over when it is None).
+    remaining_days also accounts for leaves already approved in that year,
+    matching what `_get_or_create_entitlement` would have created lazily.
+
+    Idempotent: users that already have an entitlement for the year are skipped.
+    Each batch is committed on its own. Returns number of created entitlements.
+    """
+    default_days = float(tenant.default_vacation_days or 20)
+    prev = aliased(LeaveEntitlement)
+
+    if carry_over_max is not None:
+        carried = case(
+            (prev.remaining_days.is_(None), literal(0.0)),
+            (prev.remaining_days > carry_over_max, literal(float(carry_over_max))),
+            (prev.remaining_days > 0, prev.remaining_days),
+            else_=literal(0.0)
+        )
+    else:
+        carried = literal(0.0)
+
+    used = (
+        select(func.coalesce(func.sum(LeaveRequest.days_count), 0))
+        .where(
+            LeaveRequest.user_id == User.id,
+            LeaveRequest.status == LeaveStatus.APPROVED,
+            LeaveRequest.start_date >= date(year, 1, 1),
+            LeaveRequest.start_date <= date(year, 12, 31)
+        )
+        .scalar_subquery()
+    )
+
+    total = literal(default_days) + carried
+    now = func.now()
+
+    created = 0
+    while True:
+        user_ids = _missing_user_ids(db, tenant.domain, year, batch_size)
+        if not user_ids:
+            break
+
+        source = (
+            select(
+                User.id,
+                literal(year),
+                total,
+                total - used,
+                now,
+                now
+            )
+            .select_from(User)
+            .outerjoin(prev, and_(prev.user_id == User.id, prev.year == year - 1))
+            .where(User.id.in_(user_ids))
+        )
+        db.execute(
+            insert(LeaveEntitlement).from_select(
+                ["user_id", "year", "total_days", "remaining_days", "created_at", "updated_at"],
+                source
+            )
+        )
+        db.commit()
+        created += len(user_ids)
+
+    return created
+
+
+def rollover_entitlements(
+    db: Session,
+    year: int,
+    domain: Optional[str] = None,
+    carry_over_max: Optional[float] = None,
+    batch_size: int = 500
+) -> dict:
+    """
+    Run the year rollover for one tenant (by domain) or for all tenants.
+    """
+    query = select(Tenant).order_by(Tenant.id)
+    if domain:
+        query = query.where(Tenant.domain == domain)
+    tenants = db.scalars(query).all()
+
+    results = {}
+    for tenant in tenants:
+        results[tenant.domain] = rollover_tenant(
+            db, tenant, year,
+            carry_over_max=carry_over_max,
+            batch_size=batch_size
+        )
+
+    return {
+        "year": year,
+        "tenants": len(tenants),
+        "created": sum(results.values()),
+        "per_tenant": results
+    }
+
+
+if __name__ == "__main__":
+    # Usage: python -m app.logic.rollover --year 2027 [--domain example.com] [--carry-over-max 5]
+    import argparse
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Create next-year leave entitlements in bulk.")
+    parser.add_argument("--year", type=int, default=date.today().year + 1)
+    parser.add_argument("--domain", type=str, default=None, help="Limit to a single tenant (default: all tenants)")
+    parser.add_argument("--carry-over-max", type=float, default=None, help="Carry over up to N remaining days")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = rollover_entitlements(
+            db, args.year,
+            domain=args.domain,
+            carry_over_max=args.carry_over_max,
+            batch_size=args.batch_size
+        )
+        print(f"✅ Rollover {result['year']}: {result['created']} entitlements created across {result['tenants']} tenants")
+    finally:
+        db.close()
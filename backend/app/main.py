@@ -1,17 +1,16 @@
 import logging
 import os
-import sys
+import secrets
+from typing import Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-# Configure logging to see output in Cloud Run
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(levelname)s: %(message)s",
-    stream=sys.stdout
-)
+from app.logging_config import configure_logging, should_log_health_probe
+
+# Queue-backed logging to stdout (JSON on Cloud Run)
+configure_logging(logging.INFO)
 logger = logging.getLogger("offdays")
 
 logger.info("🎬 Starting Offdays Backend...")
@@ -24,34 +23,25 @@ from app.routers import billing; logger.info("  - billing loaded")
 from app.routers import integrations; logger.info("  - integrations loaded")
 from app.routers import leaves
 from app.routers import tenants
+from app.routers import me
+from app.routers import profiling
 from app import auth
-from app.database import Base, engine
+from app.database import Base, engine, read_engine
+from app.db_metrics import pool_snapshot
+from app.metrics import MetricsMiddleware, render as render_metrics
 from app import models  # Ensure models are registered
 from app.startup_migration import seed_initial_data
+from app.config import settings
 
 # Security & Rate Limiting
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
+from slowapi.middleware import SlowAPIASGIMiddleware
 from app.limiter import limiter
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from app.middleware import ReadPrimaryCookieMiddleware, SecurityHeadersMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        try:
-            response = await call_next(request)
-            response.headers["X-Content-Type-Options"] = "nosniff"
-            response.headers["X-Frame-Options"] = "DENY"
-            response.headers["Strict-Transport-Security"] = "max-age=63072000; includeSubDomains; preload"
-            response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-            return response
-        except Exception as e:
-            logger.error(f"💥 SecurityHeadersMiddleware error: {e}", exc_info=True)
-            raise e
-
 app = FastAPI(title="Offdays API", description="Secure Password Management API")
 app.state.limiter = limiter
 @app.exception_handler(Exception)
@@ -60,8 +50,23 @@ async def debug_exception_handler(request: Request, exc: Exception):
     return Response(status_code=500, content=f"Internal Error: {exc}")
 
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-app.add_middleware(SlowAPIMiddleware)
+app.add_middleware(SlowAPIASGIMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(MetricsMiddleware)
+if read_engine is not engine:
+    app.add_middleware(ReadPrimaryCookieMiddleware)
+
+if settings.tracing_exporter:
+    from app.tracing import TracingMiddleware
+    app.add_middleware(TracingMiddleware)
+
+if settings.query_profiler:
+    from app.query_profiler import QueryProfilerMiddleware
+    app.add_middleware(QueryProfilerMiddleware)
+
+if settings.profiling_enabled:
+    from app.profiling import ProfilingMiddleware
+    app.add_middleware(ProfilingMiddleware)
 
 
 @app.on_event("startup")
@@ -77,7 +82,24 @@ async def startup_event():
         # but in this case, it might be better to know.
         # raise e 
 
-from app.config import settings
+    from app.invalidation import start_listener
+    from app.cache import enable_long_ttl
+    if start_listener():
+        enable_long_ttl()
+
+    if settings.profiling_enabled:
+        from app.profiling import loop_lag, profile_sync_endpoints
+        loop_lag.start()
+        profile_sync_endpoints(app.routes)
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    from app.invalidation import stop_listener
+    stop_listener()
+
+    from app.profiling import loop_lag
+    loop_lag.stop()
 
 # CORS settings
 origins = [
@@ -96,14 +118,48 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
 
 @app.get("/")
 def health_check(request: Request):
     """Health check endpoint for Cloud Run."""
-    logger.info(f"🩺 Health check requested from {request.client.host if request.client else 'unknown'}")
+    if should_log_health_probe():
+        logger.info(f"🩺 Health check requested from {request.client.host if request.client else 'unknown'}")
     return {"status": "ok", "service": "offdays-backend"}
 
+def _metrics_auth_error(request: Request) -> Optional[Response]:
+    """404 while METRICS_TOKEN is unset, 401 without the matching bearer token, else None."""
+    if not settings.metrics_token:
+        return Response(status_code=404)
+    if not secrets.compare_digest(
+        request.headers.get("Authorization", "").encode(), f"Bearer {settings.metrics_token}".encode()
+    ):
+        return Response(status_code=401)
+    return None
+
+@app.get("/health/db", include_in_schema=False)
+def db_pool_health(request: Request):
+    """
+    Connection-pool gauges and wait times, per engine (for sizing pool_size / max_overflow).
+    Behind the same token as /metrics.
+    """
+    error = _metrics_auth_error(request)
+    if error is not None:
+        return error
+    pools = {"primary": pool_snapshot(engine)}
+    if read_engine is not engine:
+        pools["replica"] = pool_snapshot(read_engine)
+    return {"status": "ok", "pools": pools}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    """Prometheus scrape endpoint (per instance)."""
+    error = _metrics_auth_error(request)
+    if error is not None:
+        return error
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 app.include_router(auth.router)
 app.include_router(users.router)
 
@@ -112,6 +168,8 @@ app.include_router(billing.router)
 app.include_router(integrations.router)
 app.include_router(leaves.router)
 app.include_router(tenants.router)
+app.include_router(me.router)
+app.include_router(profiling.router)
 
 
 # Mount static files if directory exists
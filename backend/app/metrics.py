@@ -0,0 +1,251 @@
+"""
+Minimal Prometheus-compatible metrics (text exposition format 0.0.4).
+
+Counters and histograms are kept in-process per instance and rendered by
+GET /metrics; values that already live elsewhere (pool state, cache stats)
+are read at scrape time through `register_collector` / `register_cache`.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_metrics: List["_Metric"] = []
+_collectors: List[Callable[[], Iterable[str]]] = []
+_caches: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> [bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        series = self._values.get(self._key(labels))
+        return series[-1] if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        bucket_labels = self.labelnames + ("le",)
+        for key, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(bucket_labels, key + (_format_value(bound),))} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+def sample_lines(name: str, documentation: str, kind: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> List[str]:
+    """Exposition lines for values read at scrape time (for collectors)."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+    return lines
+
+
+def register_collector(collect: Callable[[], Iterable[str]]) -> None:
+    """`collect()` returns exposition lines; called on every scrape."""
+    _collectors.append(collect)
+
+
+def register_cache(name: str, stats: Callable[[], Tuple[int, int]]) -> None:
+    """Report a cache's hits and misses; `stats()` returns (hits, misses)."""
+    _caches[name] = stats
+
+
+def _collect_caches() -> List[str]:
+    stats = {name: fn() for name, fn in _caches.items()}
+    return (
+        sample_lines("offdays_cache_hits_total", "Cache hits.", "counter",
+                     [({"cache": n}, h) for n, (h, m) in stats.items()])
+        + sample_lines("offdays_cache_misses_total", "Cache misses.", "counter",
+                       [({"cache": n}, m) for n, (h, m) in stats.items()])
+        + sample_lines("offdays_cache_hit_ratio", "Hits / lookups since start.", "gauge",
+                       [({"cache": n}, h / (h + m) if h + m else 0.0) for n, (h, m) in stats.items()])
+    )
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.extend(metric.header())
+        lines.extend(metric.render())
+    for collect in _collectors:
+        lines.extend(collect())
+    lines.extend(_collect_caches())
+    return "\n".join(lines) + "\n"
+
+
+# --- Application metrics ---
+
+HTTP_REQUEST_DURATION = Histogram(
+    "offdays_http_request_duration_seconds",
+    "HTTP request latency by route template and status code.",
+    ("method", "route", "status"),
+)
+DB_QUERIES = Counter(
+    "offdays_db_queries_total",
+    "SQL statements executed.",
+)
+DB_QUERY_DURATION = Histogram(
+    "offdays_db_query_duration_seconds",
+    "SQL statement execution time.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+GOOGLE_API_DURATION = Histogram(
+    "offdays_google_api_duration_seconds",
+    "Google API call latency by operation.",
+    ("operation",),
+)
+GOOGLE_API_ERRORS = Counter(
+    "offdays_google_api_errors_total",
+    "Failed Google API calls by operation.",
+    ("operation",),
+)
+SMTP_SEND_DURATION = Histogram(
+    "offdays_smtp_send_duration_seconds",
+    "SMTP send latency.",
+)
+SMTP_ERRORS = Counter(
+    "offdays_smtp_errors_total",
+    "Failed SMTP sends.",
+)
+
+
+@contextmanager
+def track_google_call(operation: str):
+    """Time a Google API call; an exception counts as an error."""
+    with GOOGLE_API_DURATION.time(operation=operation):
+        try:
+            yield
+        except Exception:
+            GOOGLE_API_ERRORS.inc(operation=operation)
+            raise
+
+
+class MetricsMiddleware:
+    """Request latency by route template (not raw path, to keep label cardinality bounded)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                method=scope["method"], route=route, status=status,
+            )
@@ -0,0 +1,83 @@
+"""
+Pure-ASGI middlewares.
+
+Unlike BaseHTTPMiddleware these don't run the app in a separate task or pipe
+the body through a memory stream: they only wrap `send`, so streaming
+responses pass through chunk by chunk and per-request overhead stays small.
+
+    python -m scripts.bench_middleware   # benchmark against the BaseHTTPMiddleware stack
+"""
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth_deps import READ_PRIMARY_COOKIE
+from app.config import settings
+
+logger = logging.getLogger("offdays")
+
+SECURITY_HEADERS = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("Strict-Transport-Security", "max-age=63072000; includeSubDomains; preload"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+)
+
+
+class SecurityHeadersMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in SECURITY_HEADERS:
+                    headers[name] = value
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        except Exception as e:
+            logger.error(f"💥 SecurityHeadersMiddleware error: {e}", exc_info=True)
+            raise
+
+
+class ReadPrimaryCookieMiddleware:
+    """
+    Sets the read-your-writes cookie once a request committed on the primary
+    (see app.auth_deps.get_db). Done here rather than on FastAPI's injected
+    Response so it also reaches routes that return a Response themselves
+    (fast_json_response, cached_json_response, redirects).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        cookie = Response()
+        cookie.set_cookie(
+            READ_PRIMARY_COOKIE, "1",
+            max_age=settings.replica_read_your_writes_seconds,
+            httponly=True,
+            secure=settings.cookie_secure,
+            samesite="lax",
+        )
+        self.set_cookie = cookie.headers["set-cookie"]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and scope.get("state", {}).get("read_primary"):
+                MutableHeaders(scope=message).append("set-cookie", self.set_cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
@@ -11,11 +11,19 @@ from sqlalchemy import (
     Date,
     ForeignKey,
     Integer,
+    Float,
     UniqueConstraint,
     Text,
     JSON,
     CheckConstraint,
     Table,
+    Index,
+    func,
+    text,
+    DDL,
+    event,
+    literal_column,
+    bindparam,
 )
 
 from sqlalchemy import UUID as sa_UUID
@@ -31,6 +39,7 @@ class Tenant(Base):
     domain: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
     shared_calendar_id: Mapped[str | None] = mapped_column(String(255), nullable=True) # Corporate Google Calendar ID
     default_vacation_days: Mapped[int] = mapped_column(Integer, default=20)
+    data_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False) # Bumped on writes, drives ETags
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -66,7 +75,32 @@ class User(Base):
 
     # Leaves
     entitlements: Mapped[list["LeaveEntitlement"]] = relationship("LeaveEntitlement", back_populates="user")
-    leave_requests: Mapped[list["LeaveRequest"]] = relationship("LeaveRequest", back_populates="user")
+    leave_requests: Mapped[list["LeaveRequest"]] = relationship(
+        "LeaveRequest", back_populates="user", foreign_keys="LeaveRequest.user_id"
+    )
+
+    __table_args__ = (
+        # Keyset pagination of user lists (see app.pagination)
+        Index("ix_users_sort_name_id", func.coalesce(full_name, ""), "id"),
+        # Direct reports (managed users, supervisor approvals)
+        Index("ix_users_supervisor_id", "supervisor_id"),
+    )
+
+class UserHierarchy(Base):
+    """
+    Closure table of the supervisor tree: one row per (ancestor, descendant) pair,
+    depth 1 for direct reports. Maintained by app.logic.hierarchy on supervisor changes.
+    """
+    __tablename__ = "user_hierarchy"
+
+    ancestor_id: Mapped[uuid.UUID] = mapped_column(sa_UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    descendant_id: Mapped[uuid.UUID] = mapped_column(sa_UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        # Ancestors of a user (cycle checks, re-parenting)
+        Index("ix_user_hierarchy_descendant", "descendant_id"),
+    )
 
 class OAuthAccount(Base):
     __tablename__ = "oauth_accounts"
@@ -84,6 +118,12 @@ class OAuthAccount(Base):
 
     user: Mapped["User"] = relationship(back_populates="oauth_accounts")
 
+    __table_args__ = (
+        # Token lookup for a user, and login by Google 'sub'
+        Index("ix_oauth_accounts_user_provider", "user_id", "provider"),
+        Index("ix_oauth_accounts_provider_subject", "provider", "subject"),
+    )
+
 
 
 
@@ -151,6 +191,25 @@ class LeaveStatus(str, Enum):
     CANCELLED = "cancelled"
     CANCEL_PENDING = "cancel_pending"
 
+# Requests sitting in someone's approvals inbox
+PENDING_APPROVAL_STATUSES = (LeaveStatus.PENDING, LeaveStatus.CANCEL_PENDING)
+_PENDING_APPROVAL_WHERE = text("status IN ('pending', 'cancel_pending')")
+
+
+def pending_approval(status_column):
+    """
+    `status IN ('pending', 'cancel_pending')` with the statuses rendered as
+    literals. With bound parameters (and Postgres generic plans) the planner
+    can't prove the predicate implies the one of the partial indexes below.
+    """
+    return status_column.in_(bindparam(
+        "pending_approval_statuses",
+        [s.value for s in PENDING_APPROVAL_STATUSES],
+        expanding=True,
+        literal_execute=True,
+        unique=True,
+    ))
+
 class LeaveEntitlement(Base):
     __tablename__ = "leave_entitlements"
 
@@ -186,6 +245,8 @@ class LeaveRequest(Base):
     days_count: Mapped[float] = mapped_column(Integer, nullable=False) # Business days deduction
     
     status: Mapped[LeaveStatus] = mapped_column(String(20), default=LeaveStatus.PENDING)
+    # Requester's supervisor while the request awaits approval (kept in sync on supervisor changes)
+    approver_id: Mapped[uuid.UUID | None] = mapped_column(sa_UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     note: Mapped[str | None] = mapped_column(Text)
     
     gcal_event_id: Mapped[str | None] = mapped_column(String(255))
@@ -194,4 +255,90 @@ class LeaveRequest(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    user: Mapped["User"] = relationship("User", back_populates="leave_requests")
+    user: Mapped["User"] = relationship("User", back_populates="leave_requests", foreign_keys=[user_id])
+
+    __table_args__ = (
+        # Date-window overlap lookups (team calendar)
+        Index("ix_leave_requests_start_end", "start_date", "end_date"),
+        # Keyset pagination, newest first (see app.pagination)
+        Index("ix_leave_requests_created_id", "created_at", "id"),
+        Index("ix_leave_requests_user_created_id", "user_id", "created_at", "id"),
+        # Per-user overlap checks and history by date
+        Index("ix_leave_requests_user_start", "user_id", "start_date"),
+        # Approval queues (pending / cancel_pending, newest first)
+        Index("ix_leave_requests_status_created", "status", "created_at"),
+        # Approvals inbox: only pending rows are indexed, keyed by approver (supervisor) or by date (admin)
+        Index(
+            "ix_leave_requests_pending_approver", "approver_id", "created_at", "id",
+            postgresql_where=_PENDING_APPROVAL_WHERE, sqlite_where=_PENDING_APPROVAL_WHERE
+        ),
+        Index(
+            "ix_leave_requests_pending_created", "created_at", "id",
+            postgresql_where=_PENDING_APPROVAL_WHERE, sqlite_where=_PENDING_APPROVAL_WHERE
+        ),
+    )
+
+
+
+class LeaveRequestArchive(Base):
+    """
+    Closed-year leave requests moved out of `leave_requests` by app.logic.archive.
+    Same columns as LeaveRequest, so both can be read through one UNION ALL.
+    """
+    __tablename__ = "leave_requests_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(sa_UUID(as_uuid=True), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(sa_UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[date] = mapped_column(Date, nullable=False)
+    start_half_day: Mapped[bool] = mapped_column(Boolean, default=False)
+    end_half_day: Mapped[bool] = mapped_column(Boolean, default=False)
+    days_count: Mapped[float] = mapped_column(Integer, nullable=False)
+    status: Mapped[LeaveStatus] = mapped_column(String(20))
+    approver_id: Mapped[uuid.UUID | None] = mapped_column(sa_UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    note: Mapped[str | None] = mapped_column(Text)
+    gcal_event_id: Mapped[str | None] = mapped_column(String(255))
+    shared_gcal_event_id: Mapped[str | None] = mapped_column(String(255))
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    updated_at: Mapped[datetime] = mapped_column(DateTime)
+
+    __table_args__ = (
+        Index("ix_leave_requests_archive_user_start", "user_id", "start_date"),
+        Index("ix_leave_requests_archive_start_end", "start_date", "end_date"),
+        # max(end_date) tells readers whether a date range reaches into the archive
+        Index("ix_leave_requests_archive_end", "end_date"),
+    )
+
+# Postgres only: a generated daterange of each request with a GiST index on (user_id, period),
+# so per-user overlap lookups stay logarithmic. SQLite falls back to the (user_id, start_date) index.
+# Mirrors migration a8c2e6f4d1b9 for databases created with create_all().
+LEAVE_PERIOD = literal_column("leave_requests.period")
+
+for _ddl in (
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    "ALTER TABLE leave_requests ADD COLUMN IF NOT EXISTS period daterange "
+    "GENERATED ALWAYS AS (daterange(start_date, end_date, '[]')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_leave_requests_user_period ON leave_requests USING gist (user_id, period)",
+):
+    event.listen(LeaveRequest.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
+
+
+class RateLimitBucket(Base):
+    """
+    Token bucket shared by all instances (app.rate_limit.DatabaseStorage).
+    Key is "<scope>:<user or tenant>"; tokens are refilled lazily on each hit.
+    Rows idle for a day are full buckets and get purged (DatabaseStorage.purge_idle).
+    """
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    # Unix time of the last refill
+    updated_at: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+# Counters can be lost in a crash; skip the WAL for them (Postgres only, mirrors migration d5f1a9c3e7b2)
+event.listen(
+    RateLimitBucket.__table__, "after_create",
+    DDL("ALTER TABLE rate_limit_buckets SET UNLOGGED").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,97 @@
+import base64
+import json
+from datetime import datetime, date
+from typing import Any, Callable, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 500
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "u" in value:
+            return UUID(value["u"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor from the sort key of the last row of a page."""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list):
+            raise ValueError("cursor must encode a list")
+        return [_decode_value(v) for v in values]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_paginate(
+    query,
+    keys: Sequence[Any],
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    descending: bool = False
+):
+    """
+    Order `query` (a select() or a legacy Query) by `keys` and,
+    if a cursor is given, continue after it.
+
+    Uses a row-value comparison so that a matching composite index
+    can seek directly to the start of the page.
+    Fetches one extra row so `page_response` can tell if there is a next page.
+    """
+    query = query.order_by(None).order_by(*[k.desc() if descending else k.asc() for k in keys])
+
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(keys):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if descending:
+            query = query.where(tuple_(*keys) < tuple_(*values))
+        else:
+            query = query.where(tuple_(*keys) > tuple_(*values))
+
+    if limit:
+        query = query.limit(limit + 1)
+    return query
+
+
+def page_response(
+    response: Response,
+    rows: Sequence[Any],
+    key: Callable[[Any], Sequence[Any]],
+    limit: Optional[int] = None
+) -> list:
+    """
+    Trim the extra row fetched by `keyset_paginate` and expose the
+    next cursor in the X-Next-Cursor header (absent on the last page).
+    """
+    rows = list(rows)
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(key(rows[-1]))
+    return rows
@@ -0,0 +1,295 @@
+"""
+On-demand profiling of a running worker (admins only, PROFILING_ENABLED=true).
+
+- `X-Profile: cprofile` on any request returns that request's cProfile stats
+  instead of its body (original status in X-Profile-Original-Status). One
+  profiled request at a time per worker; others get 409.
+- tracemalloc snapshots can be taken and diffed through /admin/profiling.
+- `LoopLagMonitor` measures how late the event loop runs a scheduled callback.
+
+Everything is per worker process: the answer describes the instance that served it.
+"""
+import asyncio
+import cProfile
+import functools
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+from uuid import UUID
+
+import jwt
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import register_collector, sample_lines
+
+logger = logging.getLogger("offdays")
+
+PROFILE_HEADER = "X-Profile"
+
+
+# --- cProfile for a single request ---
+
+# Profiles of the current request: one for the event loop, one per worker-thread call
+_request_profiles: ContextVar[Optional[List[cProfile.Profile]]] = ContextVar("request_profiles", default=None)
+
+# From 3.12 cProfile runs on sys.monitoring: a single profiler per process, and
+# it sees every thread. Enabling a second one raises ValueError, so profiled
+# requests are serialised, and worker threads only need their own profile before 3.12.
+_profile_lock = threading.Lock()
+_PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+
+def _is_admin_request(request: Request) -> bool:
+    from app import models
+    from app.auth_deps import token_from_request
+    from app.database import SessionLocal
+
+    token = token_from_request(request)
+    if not token:
+        return False
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
+        user_id = UUID(payload.get("sub"))
+    except (jwt.PyJWTError, TypeError, ValueError):
+        return False
+    db = SessionLocal()
+    try:
+        user = db.get(models.User, user_id)
+        return bool(user and user.is_active and user.is_admin)
+    finally:
+        db.close()
+
+
+def _format_stats(profiles: List[cProfile.Profile], sort: str, limit: int) -> str:
+    stream = io.StringIO()
+    stats = pstats.Stats(profiles[0], stream=stream)
+    for profile in profiles[1:]:
+        stats.add(profile)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+def profile_sync_endpoints(routes) -> None:
+    """
+    Sync endpoints run in a worker thread, which the event-loop profiler does
+    not see before 3.12; wrap them so a profiled request also profiles that thread.
+    """
+    if not _PER_THREAD_PROFILES:
+        return
+    for route in routes:
+        if not isinstance(route, APIRoute) or asyncio.iscoroutinefunction(route.dependant.call):
+            continue
+        route.dependant.call = _profiled_call(route.dependant.call)
+
+
+def _profiled_call(call):
+    @functools.wraps(call)
+    def wrapper(*args, **kwargs):
+        profiles = _request_profiles.get()
+        if profiles is None:
+            return call(*args, **kwargs)
+        profile = cProfile.Profile()
+        profiles.append(profile)
+        return profile.runcall(call, *args, **kwargs)
+    return wrapper
+
+
+async def _profiler_busy(scope: Scope, receive: Receive, send: Send) -> None:
+    response = Response(
+        "Another profiler is running in this worker, retry shortly\n",
+        status_code=409,
+        media_type="text/plain",
+    )
+    await response(scope, receive, send)
+
+
+class ProfilingMiddleware:
+    """Answers `X-Profile: cprofile` requests from admins with the request's cProfile stats."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        if request.headers.get(PROFILE_HEADER, "").lower() != "cprofile":
+            await self.app(scope, receive, send)
+            return
+        if not await asyncio.to_thread(_is_admin_request, request):
+            await self.app(scope, receive, send)
+            return
+
+        if not _profile_lock.acquire(blocking=False):
+            await _profiler_busy(scope, receive, send)
+            return
+        try:
+            await self._profile(request, scope, receive, send)
+        finally:
+            _profile_lock.release()
+
+    async def _profile(self, request: Request, scope: Scope, receive: Receive, send: Send) -> None:
+        status = 500
+
+        async def discard_response(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        loop_profile = cProfile.Profile()
+        try:
+            loop_profile.enable()
+        except ValueError:
+            # Another tool (debugger, coverage, ...) holds the 3.12+ profiling slot
+            await _profiler_busy(scope, receive, send)
+            return
+        profiles = [loop_profile]
+        token = _request_profiles.set(profiles)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, discard_response)
+        finally:
+            loop_profile.disable()
+            _request_profiles.reset(token)
+        elapsed = time.perf_counter() - started
+
+        sort = request.query_params.get("profile_sort", "cumulative")
+        if sort not in ("cumulative", "tottime", "calls"):
+            sort = "cumulative"
+        body = f"{request.method} {request.url.path} took {elapsed * 1000:.1f} ms\n\n"
+        body += _format_stats(profiles, sort, limit=60)
+        logger.info(f"🔬 Profiled {request.method} {request.url.path} ({elapsed * 1000:.1f} ms)")
+        response = Response(
+            body,
+            media_type="text/plain",
+            headers={"X-Profile-Original-Status": str(status)},
+        )
+        await response(scope, receive, send)
+
+
+# --- tracemalloc ---
+
+_last_snapshot: Optional[tracemalloc.Snapshot] = None
+
+
+def start_tracemalloc(frames: int = 10) -> None:
+    global _last_snapshot
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    _last_snapshot = None
+
+
+def stop_tracemalloc() -> None:
+    global _last_snapshot
+    tracemalloc.stop()
+    _last_snapshot = None
+
+
+def take_snapshot(limit: int = 25, group_by: str = "lineno") -> Dict[str, Any]:
+    """
+    Snapshot allocations. Returns the top allocation sites, and the growth per
+    site since the previous snapshot (the diff is what shows a leak).
+    """
+    global _last_snapshot
+    if not tracemalloc.is_tracing():
+        start_tracemalloc()
+
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+    result: Dict[str, Any] = {
+        "traced_bytes": current,
+        "peak_bytes": peak,
+        "top": [
+            {"site": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+            for stat in snapshot.statistics(group_by)[:limit]
+        ],
+    }
+    if _last_snapshot is not None:
+        result["diff"] = [
+            {
+                "site": str(stat.traceback),
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size_bytes": stat.size,
+            }
+            for stat in snapshot.compare_to(_last_snapshot, group_by)[:limit]
+        ]
+    _last_snapshot = snapshot
+    return result
+
+
+# --- Event-loop lag ---
+
+class LoopLagMonitor:
+    """
+    Sleeps `interval` seconds in a loop and records how much later than
+    scheduled it wakes up: time callbacks spend waiting for a blocked loop.
+    """
+
+    def __init__(self, interval: float = 0.5, window: int = 600):
+        self.interval = interval
+        self.samples: Deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - expected, 0.0))
+
+    def stats(self) -> Dict[str, Any]:
+        samples = sorted(self.samples)
+        if not samples:
+            return {"samples": 0, "interval_seconds": self.interval}
+
+        def pct(p: float) -> float:
+            return round(samples[min(int(p * len(samples)), len(samples) - 1)], 6)
+
+        return {
+            "samples": len(samples),
+            "interval_seconds": self.interval,
+            "last_seconds": round(self.samples[-1], 6),
+            "p50_seconds": pct(0.50),
+            "p99_seconds": pct(0.99),
+            "max_seconds": round(samples[-1], 6),
+        }
+
+
+loop_lag = LoopLagMonitor()
+
+
+def _collect_loop_lag() -> List[str]:
+    if not loop_lag.samples:
+        return []
+    return sample_lines(
+        "offdays_event_loop_lag_seconds", "Delay of the last loop-lag probe callback.", "gauge",
+        [({}, loop_lag.samples[-1])],
+    )
+
+
+register_collector(_collect_loop_lag)
@@ -0,0 +1,209 @@
+"""
+Per-request SQL profiling: query count, DB time and repeated statements (N+1).
+
+Enabled with QUERY_PROFILER=true. Each request gets a `QueryProfile`; the
+middleware reports it as a `Server-Timing` header and a log line, and warns
+when a route exceeds its entry in `QUERY_BUDGETS`. In tests:
+
+    client.get("/leaves/approvals")
+    assert_route_budget("/leaves/approvals", max_repeats=0)
+
+Code called directly (logic functions, CLI jobs) can be wrapped in `profile_queries()`.
+"""
+import logging
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger("offdays.queries")
+
+# Max queries per request for a route (path template as declared on the router).
+# Exceeding it logs a warning; tests can assert it with `assert_route_budget`.
+QUERY_BUDGETS: Dict[str, int] = {
+    "/leaves/approvals": 6,
+    "/leaves/{request_id}/approve": 20,
+    "/leaves/{request_id}/reject": 15,
+    "/tenants/me/sync": 10,
+}
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryProfile:
+    """Queries seen while this profile was active."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.duration += seconds
+            self.statements[statement] += 1
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times: the N+1 signature."""
+        if threshold is None:
+            threshold = settings.query_profiler_repeat_threshold
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+    def assert_budget(self, max_queries: Optional[int] = None, max_repeats: Optional[int] = None) -> None:
+        """
+        Raise QueryBudgetExceeded when more than `max_queries` ran, or when any
+        statement ran more than `max_repeats` extra times.
+        """
+        if max_queries is not None and self.count > max_queries:
+            raise QueryBudgetExceeded(f"{self.count} queries, budget is {max_queries}")
+        if max_repeats is not None:
+            worst = self.statements.most_common(1)
+            if worst and worst[0][1] - 1 > max_repeats:
+                raise QueryBudgetExceeded(
+                    f"Statement repeated {worst[0][1]} times: {_shorten(worst[0][0])}"
+                )
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+_current: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+# Last profiles per route, so tests driving the app through TestClient can inspect them
+_recent: Dict[str, Deque[QueryProfile]] = {}
+_RECENT_PER_ROUTE = 20
+
+
+def _shorten(statement: str, limit: int = 200) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_profiler_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is None:
+        return
+    starts = conn.info.get("query_profiler_start")
+    if not starts:
+        return
+    profile.record(statement, time.perf_counter() - starts.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement skips after_cursor_execute: record it here so its start isn't left behind
+    conn = exception_context.connection
+    starts = conn.info.get("query_profiler_start") if conn is not None else None
+    profile = _current.get()
+    if starts and profile is not None:
+        profile.record(exception_context.statement or "", time.perf_counter() - starts.pop())
+
+
+@contextmanager
+def profile_queries():
+    """Collect the queries run inside the block (in this context) into a QueryProfile."""
+    profile = QueryProfile()
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+
+
+def last_profile(route: str) -> Optional[QueryProfile]:
+    """Most recent profile the middleware recorded for `route`."""
+    profiles = _recent.get(route)
+    return profiles[-1] if profiles else None
+
+
+def assert_route_budget(route: str, max_repeats: Optional[int] = None) -> None:
+    """Check the last request to `route` against its QUERY_BUDGETS entry."""
+    profile = last_profile(route)
+    if profile is None:
+        raise QueryBudgetExceeded(f"No profiled request for {route}")
+    profile.assert_budget(max_queries=QUERY_BUDGETS.get(route), max_repeats=max_repeats)
+
+
+def _report(method: str, route: str, status_code: int, profile: QueryProfile) -> None:
+    _recent.setdefault(route, deque(maxlen=_RECENT_PER_ROUTE)).append(profile)
+
+    repeated = profile.repeated()
+    budget = QUERY_BUDGETS.get(route)
+    fields = {
+        "method": method,
+        "route": route,
+        "status": status_code,
+        "queries": profile.count,
+        "db_ms": round(profile.duration * 1000, 1),
+        "budget": budget,
+        "repeated": [{"count": n, "statement": _shorten(sql)} for sql, n in repeated],
+    }
+    if repeated:
+        logger.warning(
+            f"🔁 N+1 suspect on {method} {route}: "
+            f"{repeated[0][1]}x {_shorten(repeated[0][0], 120)}",
+            extra={"query_profile": fields},
+        )
+    if budget is not None and profile.count > budget:
+        logger.warning(
+            f"🐢 {method} {route} ran {profile.count} queries (budget {budget})",
+            extra={"query_profile": fields},
+        )
+    elif not repeated:
+        logger.info(
+            f"🗄️ {method} {route}: {profile.count} queries, {fields['db_ms']}ms",
+            extra={"query_profile": fields},
+        )
+
+
+class QueryProfilerMiddleware:
+    """
+    Profile the SQL of each request (installed only when QUERY_PROFILER=true).
+    Server-Timing covers the queries run before the response started.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        token = _current.set(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", scope["path"])
+            _report(scope["method"], route, status, profile)
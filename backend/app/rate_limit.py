@@ -0,0 +1,207 @@
+"""
+Token-bucket rate limiting keyed by JWT subject and tenant.
+
+Unlike the slowapi limiter (per process, per IP) the buckets can live in the
+database, so a quota holds across all instances behind Cloud Run:
+
+    @router.post("/me/sync", dependencies=[Depends(require_admin), Depends(rate_limit("tenant_sync", per_tenant="10/hour"))])
+
+Dependencies run in the order listed: put permission checks before the
+limiter, or rejected callers drain the buckets of the users allowed in.
+
+RATE_LIMIT_STORAGE picks the backend: "memory" (single node, default locally)
+or "database" (shared `rate_limit_buckets` table, default on Postgres).
+"""
+import math
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import jwt
+from fastapi import HTTPException, Request, status
+from sqlalchemy import delete, func, select
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.limiter import client_ip
+from app.metrics import Counter
+
+RATE_LIMITED = Counter(
+    "offdays_rate_limited_total",
+    "Requests rejected by the token-bucket limiter, by scope and level (user/tenant).",
+    ("scope", "level"),
+)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# A bucket refills completely in one period of its rate ("N/hour": an hour), so
+# one idle for the longest period is full, the same as no bucket: safe to drop.
+IDLE_AFTER = max(_PERIODS.values())
+# How often each instance drops idle buckets, piggybacking on a consume call
+PURGE_INTERVAL = 300
+
+
+def parse_rate(rate: str) -> Tuple[float, float]:
+    """"10/minute" -> (capacity 10, refill 10/60 tokens per second)."""
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(second|minute|hour|day)\s*", rate)
+    if not match:
+        raise ValueError(f"Invalid rate: {rate!r}")
+    count = int(match.group(1))
+    return float(count), count / _PERIODS[match.group(2)]
+
+
+class MemoryStorage:
+    """Buckets in this process only."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._next_purge = time.time() + PURGE_INTERVAL
+
+    def purge_idle(self, now: Optional[float] = None) -> int:
+        """Drop buckets untouched for IDLE_AFTER seconds. Returns how many."""
+        cutoff = (now if now is not None else time.time()) - IDLE_AFTER
+        with self._lock:
+            idle = [key for key, (_, updated_at) in self._buckets.items() if updated_at < cutoff]
+            for key in idle:
+                del self._buckets[key]
+        return len(idle)
+
+    def consume(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """Take `cost` tokens. Returns (allowed, seconds until allowed)."""
+        now = time.time()
+        if now >= self._next_purge:
+            self._next_purge = now + PURGE_INTERVAL
+            self.purge_idle(now)
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                return True, 0.0
+            self._buckets[key] = (tokens, now)
+            return False, (cost - tokens) / rate
+
+
+class DatabaseStorage:
+    """
+    Buckets in `rate_limit_buckets`, shared by all instances.
+    Each check is one atomic upsert (Postgres; SQLite works as a local stand-in).
+    """
+
+    def __init__(self, engine: Engine):
+        from app.models import RateLimitBucket
+
+        self.engine = engine
+        self.table = RateLimitBucket.__table__
+        if engine.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+            self._least = func.least
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+            self._least = func.min
+        self._insert = insert
+        self._next_purge = time.time() + PURGE_INTERVAL
+
+    def purge_idle(self, now: Optional[float] = None) -> int:
+        """
+        Delete buckets untouched for IDLE_AFTER seconds, so one-off keys (an IP
+        that called once) don't stay forever. Returns how many rows went.
+        """
+        cutoff = (now if now is not None else time.time()) - IDLE_AFTER
+        with self.engine.begin() as conn:
+            return conn.execute(delete(self.table).where(self.table.c.updated_at < cutoff)).rowcount
+
+    def consume(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.time()
+        if now >= self._next_purge:
+            # Per instance; concurrent purges from several instances are harmless
+            self._next_purge = now + PURGE_INTERVAL
+            self.purge_idle(now)
+        t = self.table
+        refilled = self._least(capacity, t.c.tokens + (now - t.c.updated_at) * rate)
+        stmt = self._insert(t).values(key=key, tokens=capacity - cost, updated_at=now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[t.c.key],
+            set_={"tokens": refilled - cost, "updated_at": now},
+            where=refilled >= cost,
+        ).returning(t.c.tokens)
+
+        with self.engine.begin() as conn:
+            if conn.execute(stmt).first() is not None:
+                return True, 0.0
+            # Not enough tokens: the row was left as is
+            tokens = conn.scalar(select(refilled).where(t.c.key == key)) or 0.0
+        return False, max(cost - tokens, 0.0) / rate
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                if settings.rate_limit_storage == "database":
+                    from app.database import engine
+                    _storage = DatabaseStorage(engine)
+                else:
+                    _storage = MemoryStorage()
+    return _storage
+
+
+def set_storage(storage) -> None:
+    """Swap the backend (tests, or a Redis-backed implementation of `consume`)."""
+    global _storage
+    _storage = storage
+
+
+def _identity(request: Request) -> Tuple[str, Optional[str]]:
+    """(user key, tenant domain) from the JWT, without a DB lookup; client IP when anonymous."""
+    from app.auth_deps import token_from_request
+
+    token = token_from_request(request)
+    if token:
+        try:
+            payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
+            if payload.get("sub"):
+                return f"user:{payload['sub']}", payload.get("domain")
+        except jwt.PyJWTError:
+            pass
+    return f"ip:{client_ip(request)}", None
+
+
+def rate_limit(scope: str, per_user: Optional[str] = None, per_tenant: Optional[str] = None):
+    """
+    Dependency enforcing token buckets for `scope`: one per user (or client IP
+    when anonymous) and one shared by the user's tenant. Rates look like "10/minute".
+    """
+    user_rate = parse_rate(per_user) if per_user else None
+    tenant_rate = parse_rate(per_tenant) if per_tenant else None
+
+    def dependency(request: Request) -> None:
+        if not settings.rate_limit_enabled:
+            return
+        user_key, tenant = _identity(request)
+        checks = []
+        if user_rate:
+            checks.append(("user", f"{scope}:{user_key}", user_rate))
+        if tenant_rate and tenant:
+            checks.append(("tenant", f"{scope}:tenant:{tenant}", tenant_rate))
+
+        storage = get_storage()
+        for level, key, (capacity, rate) in checks:
+            allowed, retry_after = storage.consume(key, capacity, rate)
+            if not allowed:
+                RATE_LIMITED.inc(scope=scope, level=level)
+                detail = "Rate limit exceeded" if level == "user" else "Organization rate limit exceeded"
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=f"{detail}. Try again later.",
+                    headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+                )
+
+    return dependency
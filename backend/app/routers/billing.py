@@ -1,21 +1,44 @@
+import logging
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app import models, schemas
-from app.auth_deps import get_current_user
+from app.auth_deps import get_current_user, get_current_reader
+from app.etag import bump_tenant_version, conditional_get
 from app.database import SessionLocal
 from app.billing.manager import SubscriptionManager
 
+logger = logging.getLogger("offdays")
+
 router = APIRouter(prefix="/billing", tags=["billing"])
 
-from app.auth_deps import get_db
+from app.auth_deps import get_db, get_read_db
+
+def _subscription_state(db: Session, domain: str):
+    """Subscription status for the ETag; a trial past its end counts as expired before the write records it."""
+    row = db.execute(
+        select(models.Subscription.status, models.Subscription.trial_ends_at)
+        .join(models.Tenant, models.Tenant.id == models.Subscription.tenant_id)
+        .where(models.Tenant.domain == domain)
+    ).first()
+    if row is None:
+        return None
+    status, trial_ends_at = row
+    if status == models.SubscriptionStatus.TRIAL and trial_ends_at is not None and trial_ends_at < datetime.utcnow():
+        status = models.SubscriptionStatus.EXPIRED
+    return status, trial_ends_at
 
 @router.get("/current")
 def get_current_subscription(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    etag: str = Depends(conditional_get("billing", state=_subscription_state)),
+    current_user: models.User = Depends(get_current_reader),
+    db: Session = Depends(get_read_db),
+    primary_db: Session = Depends(get_db)
 ):
     """
     Get current subscription status and plan usage.
+    Served from the read replica; creating a missing trial or expiring one uses the primary.
     """
     try:
         user_domain = current_user.email.split("@")[-1]
@@ -23,18 +46,33 @@ def get_current_subscription(
         if not tenant:
             # Auto-create tenant if missing (should be handled in auth, but safety net)
             # Or just raise 404
-            print(f"Tenant not found for domain {user_domain}")
+            logger.warning(f"Tenant not found for domain {user_domain}")
             raise HTTPException(status_code=404, detail="Tenant not found")
 
         manager = SubscriptionManager(db)
         sub = manager.get_subscription(tenant.id)
+
+        trial_expired = (
+            sub is not None
+            and sub.status == models.SubscriptionStatus.TRIAL
+            and sub.trial_ends_at is not None
+            and sub.trial_ends_at < datetime.utcnow()
+        )
+        if sub is None or trial_expired:
+            # Write path: redo the lookups on the primary
+            db = primary_db
+            tenant = db.query(models.Tenant).filter_by(domain=user_domain).first()
+            manager = SubscriptionManager(db)
+            sub = manager.get_subscription(tenant.id)
         
         if not sub:
-            print(f"No subscription for tenant {tenant.id}, creating default trial...")
+            logger.info(f"No subscription for tenant {tenant.id}, creating default trial...")
+            # Committed together with the new subscription
+            bump_tenant_version(db, tenant.domain)
             sub = manager.ensure_trial_subscription(tenant)
             
             if not sub:
-                print("Failed to create subscription.")
+                logger.error("Failed to create subscription.")
                 return {
                     "status": "none", 
                     "plan": None, 
@@ -43,13 +81,13 @@ def get_current_subscription(
                 }
 
         # Check for trial expiration
-        from datetime import datetime
         if sub.status == models.SubscriptionStatus.TRIAL and sub.trial_ends_at:
              # Check if trial ended (compare naive UTC if that's what we store, or aware)
              # DB stores naive UTC usually in this setup
              if sub.trial_ends_at < datetime.utcnow():
-                 print(f"Trial expired for tenant {tenant.id}. Updating status.")
+                 logger.info(f"Trial expired for tenant {tenant.id}. Updating status.")
                  sub.status = models.SubscriptionStatus.EXPIRED
+                 bump_tenant_version(db, tenant.domain)
                  db.commit()
                  db.refresh(sub)
 
@@ -79,7 +117,7 @@ def get_current_subscription(
             }
         }
     except Exception as e:
-        print(f"Error in get_current_subscription: {e}")
+        logger.error(f"Error in get_current_subscription: {e}")
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Internal Error: {str(e)}")
@@ -134,6 +172,7 @@ def test_set_plan(
         if payload.plan_id == PlanID.TRIAL.value:
              sub.status = models.SubscriptionStatus.TRIAL
              
+        bump_tenant_version(db, tenant.domain)
         db.commit()
         db.refresh(sub)
     else:
@@ -149,6 +188,7 @@ def test_set_plan(
              sub.status = models.SubscriptionStatus.TRIAL
              
         db.add(sub)
+        bump_tenant_version(db, tenant.domain)
         db.commit()
         
     return {"status": "success", "plan": payload.plan_id, "subscription_status": sub.status}
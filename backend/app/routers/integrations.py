@@ -1,3 +1,4 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
@@ -6,10 +7,16 @@ from ..database import SessionLocal
 from ..auth_deps import get_current_user, get_db
 from ..models import User, OAuthAccount
 from ..google_api import refresh_google_token, search_google_users
+from ..rate_limit import rate_limit
+
+logger = logging.getLogger("offdays")
 
 router = APIRouter(prefix="/integrations", tags=["integrations"])
 
-@router.get("/google/search-users")
+@router.get(
+    "/google/search-users",
+    dependencies=[Depends(rate_limit("people_search", per_user="60/minute", per_tenant="300/minute"))],
+)
 async def search_users(
     query: str = Query(..., min_length=1),
     current_user: User = Depends(get_current_user),
@@ -41,5 +48,5 @@ async def search_users(
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
     except Exception as e:
-        print(f"Integration error: {e}")
+        logger.error(f"Integration error: {e}")
         raise HTTPException(status_code=500, detail="Failed to search Google users")
@@ -1,25 +1,58 @@
-from typing import List
+import logging
+from typing import List, Optional, Union
 from uuid import UUID
 from datetime import datetime, timedelta, date
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import select, desc
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, case, and_, update, delete, literal
 
-from app.auth_deps import get_db
-from app.models import User, LeaveRequest, LeaveEntitlement, LeaveStatus, OAuthAccount
+from app.auth_deps import get_db, get_read_db
+from app.models import User, LeaveRequest, LeaveEntitlement, LeaveStatus, OAuthAccount, pending_approval, LEAVE_PERIOD
 from app.schemas import (
     LeaveRequestCreate, 
     LeaveRequestRead, 
     LeaveEntitlementRead,
-    LeaveEntitlementUpdate
+    LeaveEntitlementUpdate,
+    TeamBalanceRead,
+    LeaveRequestCompact,
+    LeaveRequestCompactList,
+    UserSummary
+)
+from app.auth_deps import get_current_user, get_current_reader
+from app.etag import bump_tenant_version, conditional_get
+from app.cache import cached_json_response, current_tenant_version
+from app.logic.accrual import compute_accrual, compute_accruals
+from app.logic.hierarchy import is_manager_of, subtree_user_ids
+from app.logic.archive import route_leave_query, route_leave_entities, reaches_archive, with_archive
+from app.pagination import keyset_paginate, page_response, MAX_PAGE_SIZE
+from app.serialization import (
+    LEAVE_REQUEST_LIST,
+    LEAVE_READ_COLUMNS,
+    LEAVE_USER_COLUMNS,
+    leave_rows_with_user,
+    fast_json_response
 )
-from app.auth_deps import get_current_user
-from app.logic.workdays import calculate_business_days
 from app.google_api import create_calendar_event, refresh_google_token
 from app.email import send_new_request_email, send_status_update_email
+from app.tracing import span
+
+logger = logging.getLogger("offdays")
 
 router = APIRouter(prefix="/leaves", tags=["leaves"])
 
+# Keyset sort keys for paginated lists (newest first)
+_CREATED_KEYS = (LeaveRequest.created_at, LeaveRequest.id)
+_START_KEYS = (LeaveRequest.start_date, LeaveRequest.id)
+
+def _created_key(r: LeaveRequest):
+    return (r.created_at, r.id)
+
+def _created_row_key(r):
+    return (r["created_at"], r["id"])
+
+def _start_key(r: LeaveRequest):
+    return (r.start_date, r.id)
+
 def _get_or_create_entitlement(db: Session, user: User, year: int) -> LeaveEntitlement:
     """Helper to get or create entitlement for a user/year."""
     entitlement = db.scalar(
@@ -43,14 +76,16 @@ def _get_or_create_entitlement(db: Session, user: User, year: int) -> LeaveEntit
         
         total_default = float(tenant.default_vacation_days) if tenant else 20.0
         
-        used_days = db.scalar(
+        used_days = db.scalar(route_leave_query(
+            db,
             select(func.sum(LeaveRequest.days_count))
             .where(
                 LeaveRequest.user_id == user.id,
                 LeaveRequest.status == LeaveStatus.APPROVED,
                 func.extract('year', LeaveRequest.start_date) == year
-            )
-        ) or 0.0
+            ),
+            since=date(year, 1, 1)
+        )) or 0.0
 
         entitlement = LeaveEntitlement(
             user_id=user.id,
@@ -62,19 +97,7 @@ def _get_or_create_entitlement(db: Session, user: User, year: int) -> LeaveEntit
         db.commit()
         db.refresh(entitlement)
     
-    # Calculate pro-rated accrual
-    if year > now.year:
-        accrued_days = 0.0
-    elif year < now.year:
-        accrued_days = entitlement.total_days
-    else:
-        start_of_year = datetime(year, 1, 1)
-        end_of_year = datetime(year, 12, 31)
-        days_in_year = (end_of_year - start_of_year).days + 1
-        days_elapsed = (now - start_of_year).days + 1
-        accrued_days = round((days_elapsed / days_in_year) * entitlement.total_days, 1)
-    
-    entitlement.accrued_days = accrued_days
+    entitlement.accrued_days = compute_accrual(entitlement.total_days, year, now, user_type=user.user_type)
     return entitlement
 
 @router.get("/me/entitlement", response_model=LeaveEntitlementRead)
@@ -85,20 +108,26 @@ def get_my_entitlement(
 ):
     """
     Get entitlement for specific year (or current if not specified).
+    `accrued_days` is pro-rated through today; contractors accrue nothing (always 0).
     """
     target_year = year if year else datetime.utcnow().year
     return _get_or_create_entitlement(db, current_user, target_year)
 
 @router.get("/me/requests", response_model=List[LeaveRequestRead])
 def get_my_requests(
+    response: Response,
     year: int = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
 ):
     """
-    Get list of my leave requests.
+    Get list of my leave requests, newest first.
+    Pass `limit` to page through them, following the X-Next-Cursor header.
     """
     query = select(LeaveRequest).where(LeaveRequest.user_id == current_user.id)
+    start_of_year = None
     
     if year:
         # Filter by year (using start_date year)
@@ -106,10 +135,28 @@ def get_my_requests(
         end_of_year = datetime(year, 12, 31).date()
         query = query.where(LeaveRequest.start_date >= start_of_year, LeaveRequest.start_date <= end_of_year)
         
-    requests = db.scalars(query.order_by(desc(LeaveRequest.created_at))).all()
-    return requests
+    query = keyset_paginate(query, _CREATED_KEYS, cursor, limit, descending=True)
+    requests = db.scalars(route_leave_entities(db, query, since=start_of_year)).all()
+    return page_response(response, requests, _created_key, limit)
+
 
-from datetime import date
+def _overlaps_user_range(db: Session, user_id: UUID, start_date: date, end_date: date, archived: bool = False) -> list:
+    """
+    Filters for a user's requests overlapping [start_date, end_date].
+    On Postgres this is `period && daterange(...)` on the GiST-indexed generated column,
+    elsewhere the plain range predicate on (user_id, start_date).
+    With `archived`, always the plain predicate: the archive table has no `period` column.
+    """
+    if db.get_bind().dialect.name == "postgresql" and not archived:
+        return [
+            LeaveRequest.user_id == user_id,
+            LEAVE_PERIOD.op("&&")(func.daterange(start_date, end_date, literal("[]")))
+        ]
+    return [
+        LeaveRequest.user_id == user_id,
+        LeaveRequest.start_date <= end_date,
+        LeaveRequest.end_date >= start_date
+    ]
 
 async def _create_request_internal(
     db: Session, 
@@ -136,31 +183,35 @@ async def _create_request_internal(
         # This happens if the entire range was weekends/holidays
         raise HTTPException(status_code=400, detail="No business days to request in this specific range.")
 
-    # 1. FIND OVERLAPS
-    overlaps = db.scalars(
-        select(LeaveRequest).where(
-            LeaveRequest.user_id == current_user.id,
-            LeaveRequest.start_date <= end_date,
-            LeaveRequest.end_date >= start_date,
-            LeaveRequest.status.in_([LeaveStatus.PENDING, LeaveStatus.APPROVED, LeaveStatus.CANCEL_PENDING])
+    # 1. DELETE PENDING OVERLAPS (one statement, served by the overlap index)
+    overlaps = _overlaps_user_range(db, current_user.id, start_date, end_date)
+    db.execute(
+        delete(LeaveRequest).where(
+            *overlaps,
+            pending_approval(LeaveRequest.status)
         )
-    ).all()
+    )
+
+    # 2. COLLECT APPROVED OVERLAP DATES
+    # A back-dated request can overlap approved leave that was already archived
+    approved_query = select(LeaveRequest.start_date, LeaveRequest.end_date)
+    if reaches_archive(db, start_date):
+        approved_query = with_archive(approved_query.where(
+            *_overlaps_user_range(db, current_user.id, start_date, end_date, archived=True),
+            LeaveRequest.status == LeaveStatus.APPROVED
+        ))
+    else:
+        approved_query = approved_query.where(*overlaps, LeaveRequest.status == LeaveStatus.APPROVED)
 
-    # 2. RESOLVE OVERLAPS
     approved_dates = set()
-    
-    for ol in overlaps:
-        if ol.status in [LeaveStatus.PENDING, LeaveStatus.CANCEL_PENDING]:
-            # Delete pending overlap
-            db.delete(ol)
-        elif ol.status == LeaveStatus.APPROVED:
-            ov_start = max(ol.start_date, start_date)
-            ov_end = min(ol.end_date, end_date)
-            
-            curr = ov_start
-            while curr <= ov_end:
-                 approved_dates.add(curr)
-                 curr += timedelta(days=1)
+    approved_overlaps = db.execute(approved_query).all()
+
+    for ol_start, ol_end in approved_overlaps:
+        curr = max(ol_start, start_date)
+        ov_end = min(ol_end, end_date)
+        while curr <= ov_end:
+             approved_dates.add(curr)
+             curr += timedelta(days=1)
 
     # 3. CALCULATE NET DAYS
     days_count = 0.0
@@ -194,10 +245,12 @@ async def _create_request_internal(
         end_half_day=end_half_day,
         days_count=days_count,
         note=note,
-        status=LeaveStatus.PENDING
+        status=LeaveStatus.PENDING,
+        approver_id=current_user.supervisor_id
     )
     
     db.add(new_request)
+    bump_tenant_version(db, current_user.email.split("@")[-1])
     db.commit()
     db.refresh(new_request)
 
@@ -224,7 +277,7 @@ async def _create_request_internal(
                     days=days_count
                 )
         except Exception as e:
-            print(f"Failed to send email: {e}")
+            logger.warning(f"Failed to send email: {e}")
 
     return new_request
 
@@ -302,6 +355,7 @@ def cancel_pending_request(
         raise HTTPException(status_code=400, detail="Can only delete pending requests")
         
     db.delete(leave_request)
+    bump_tenant_version(db, current_user.email.split("@")[-1])
     db.commit()
     return None
 
@@ -325,6 +379,8 @@ async def request_cancellation(
         raise HTTPException(status_code=400, detail="Can only request cancellation for approved requests")
         
     leave_request.status = LeaveStatus.CANCEL_PENDING
+    leave_request.approver_id = current_user.supervisor_id
+    bump_tenant_version(db, current_user.email.split("@")[-1])
     db.commit()
     db.refresh(leave_request)
     
@@ -346,30 +402,65 @@ async def request_cancellation(
                 days=leave_request.days_count
             )
     except Exception as e:
-        print(f"Failed to send email: {e}")
+        logger.warning(f"Failed to send email: {e}")
 
     return leave_request
 
-@router.get("/approvals", response_model=List[LeaveRequestRead])
+@router.get("/approvals", response_model=Union[List[LeaveRequestRead], LeaveRequestCompactList])
 def get_pending_approvals(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    compact: bool = False,
+    subtree: bool = False,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
 ):
     """
     Get requests waiting for my approval.
+    With `subtree`, supervisors also get requests of indirect reports.
+    With `compact`, rows reference `user_id` and users are returned once in a separate map.
+    Pass `limit` to page through them, following the X-Next-Cursor header.
     """
     admin_domain = current_user.email.split("@")[-1]
-    query = select(LeaveRequest).join(User).where(
+    # Matches the partial indexes on pending rows (ix_leave_requests_pending_*)
+    filters = [
         User.email.like(f"%@{admin_domain}"),
-        (LeaveRequest.status == LeaveStatus.PENDING) | 
-        (LeaveRequest.status == LeaveStatus.CANCEL_PENDING)
-    )
+        pending_approval(LeaveRequest.status)
+    ]
     
     if not current_user.is_admin:
-        query = query.where(User.supervisor_id == current_user.id)
-        
-    requests = db.scalars(query.options(joinedload(LeaveRequest.user)).order_by(desc(LeaveRequest.created_at))).all()
-    return requests
+        if subtree:
+            filters.append(LeaveRequest.user_id.in_(subtree_user_ids(current_user.id)))
+        else:
+            filters.append(LeaveRequest.approver_id == current_user.id)
+
+    if compact:
+        return _compact_leave_list(
+            db, filters, response=response,
+            keys=_CREATED_KEYS, cursor=cursor, limit=limit, descending=True
+        )
+
+    # Fast path: Core rows -> prebuilt TypeAdapter -> orjson
+    query = (
+        select(*LEAVE_READ_COLUMNS, *LEAVE_USER_COLUMNS)
+        .join(User, LeaveRequest.user_id == User.id)
+        .where(*filters)
+    )
+    query = keyset_paginate(query, _CREATED_KEYS, cursor, limit, descending=True)
+    rows = page_response(response, db.execute(query).mappings().all(), _created_row_key, limit)
+    return fast_json_response(LEAVE_REQUEST_LIST, leave_rows_with_user(rows), headers=response.headers)
+
+def _can_decide(current_user: User, requester: User, leave_request: LeaveRequest) -> bool:
+    """
+    Approve / reject rights: admins, the request's approver, or the requester's
+    direct supervisor. Indirect managers only see requests (subtree views).
+    """
+    return (
+        current_user.is_admin
+        or leave_request.approver_id == current_user.id
+        or requester.supervisor_id == current_user.id
+    )
 
 @router.post("/{request_id}/approve", response_model=LeaveRequestRead)
 async def approve_request(
@@ -392,7 +483,7 @@ async def approve_request(
     if admin_domain != requester_domain:
         raise HTTPException(status_code=403, detail="Forbidden - cross-domain authorization attempt")
 
-    if not current_user.is_admin and requester.supervisor_id != current_user.id:
+    if not _can_decide(current_user, requester, leave_request):
          raise HTTPException(status_code=403, detail="Not authorized")
 
     # Handle Cancellation Approval
@@ -417,8 +508,9 @@ async def approve_request(
             
             # Personal
             if leave_request.gcal_event_id and oauth:
-                token = await refresh_google_token(db, oauth)
-                await delete_calendar_event(token, leave_request.gcal_event_id)
+                with span("approve.personal_calendar"):
+                    token = await refresh_google_token(db, oauth)
+                    await delete_calendar_event(token, leave_request.gcal_event_id)
             
             # Shared
             if leave_request.shared_gcal_event_id:
@@ -431,15 +523,18 @@ async def approve_request(
                 if tenant and tenant.shared_calendar_id:
                     try:
                         from app.google_api import get_service_account_token
-                        sa_token = get_service_account_token(["https://www.googleapis.com/auth/calendar"])
-                        await delete_calendar_event(sa_token, leave_request.shared_gcal_event_id, calendar_id=tenant.shared_calendar_id)
+                        with span("approve.shared_calendar"):
+                            sa_token = get_service_account_token(["https://www.googleapis.com/auth/calendar"])
+                            await delete_calendar_event(sa_token, leave_request.shared_gcal_event_id, calendar_id=tenant.shared_calendar_id)
                     except Exception as e:
-                        print(f"Shared GCal delete error (SA): {e}")
+                        logger.warning(f"Shared GCal delete error (SA): {e}")
         except Exception as e:
-            print(f"Failed to delete GCal events: {e}")
+            logger.warning(f"Failed to delete GCal events: {e}")
             
-        db.commit()
-        db.refresh(leave_request)
+        bump_tenant_version(db, requester.email.split("@")[-1])
+        with span("approve.commit"):
+            db.commit()
+            db.refresh(leave_request)
         return leave_request
 
     # Handle Normal Approval
@@ -481,51 +576,56 @@ async def approve_request(
 
     if oauth:
         try:
-            token = await refresh_google_token(db, oauth)
-            gcal_end = (leave_request.end_date + timedelta(days=1)).isoformat()
-            
-            # 1. Sync to Personal Calendar
-            summary = f"{requester.full_name or requester.email} ({leave_request.days_count})"
-            event_id = await create_calendar_event(
-                access_token=token,
-                summary=summary,
-                start_date=leave_request.start_date.isoformat(),
-                end_date=gcal_end
-            )
-            leave_request.gcal_event_id = event_id
+            with span("approve.personal_calendar"):
+                token = await refresh_google_token(db, oauth)
+                gcal_end = (leave_request.end_date + timedelta(days=1)).isoformat()
+                
+                # 1. Sync to Personal Calendar
+                summary = f"{requester.full_name or requester.email} ({leave_request.days_count})"
+                event_id = await create_calendar_event(
+                    access_token=token,
+                    summary=summary,
+                    start_date=leave_request.start_date.isoformat(),
+                    end_date=gcal_end
+                )
+                leave_request.gcal_event_id = event_id
         except Exception as e:
-            print(f"Personal GCal error: {e}")
+            logger.warning(f"Personal GCal error: {e}")
 
     # 2. Sync to Shared Calendar (using Service Account)
     if shared_cal_id:
         try:
             from app.google_api import get_service_account_token
-            sa_token = get_service_account_token(["https://www.googleapis.com/auth/calendar"])
-            gcal_end = (leave_request.end_date + timedelta(days=1)).isoformat()
-            
-            summary = f"{requester.full_name or requester.email} ({leave_request.days_count})"
-            shared_event_id = await create_calendar_event(
-                access_token=sa_token,
-                summary=summary,
-                start_date=leave_request.start_date.isoformat(),
-                end_date=gcal_end,
-                calendar_id=shared_cal_id
-            )
-            leave_request.shared_gcal_event_id = shared_event_id
+            with span("approve.shared_calendar"):
+                sa_token = get_service_account_token(["https://www.googleapis.com/auth/calendar"])
+                gcal_end = (leave_request.end_date + timedelta(days=1)).isoformat()
+                
+                summary = f"{requester.full_name or requester.email} ({leave_request.days_count})"
+                shared_event_id = await create_calendar_event(
+                    access_token=sa_token,
+                    summary=summary,
+                    start_date=leave_request.start_date.isoformat(),
+                    end_date=gcal_end,
+                    calendar_id=shared_cal_id
+                )
+                leave_request.shared_gcal_event_id = shared_event_id
         except Exception as e:
-            print(f"Shared GCal error (SA): {e}")
+            logger.warning(f"Shared GCal error (SA): {e}")
 
-    db.commit()
-    db.refresh(leave_request)
+    bump_tenant_version(db, requester.email.split("@")[-1])
+    with span("approve.commit"):
+        db.commit()
+        db.refresh(leave_request)
 
     # EMAIL
     try:
-        await send_status_update_email(
-            to_email=requester.email,
-            status="approved",
-            start_date=str(leave_request.start_date),
-            end_date=str(leave_request.end_date)
-        )
+        with span("approve.email"):
+            await send_status_update_email(
+                to_email=requester.email,
+                status="approved",
+                start_date=str(leave_request.start_date),
+                end_date=str(leave_request.end_date)
+            )
     except: pass
 
     return leave_request
@@ -548,7 +648,7 @@ async def reject_request(
     if admin_domain != requester_domain:
         raise HTTPException(status_code=403, detail="Forbidden - cross-domain authorization attempt")
 
-    if not current_user.is_admin and requester.supervisor_id != current_user.id:
+    if not _can_decide(current_user, requester, leave_request):
          raise HTTPException(status_code=403, detail="Not authorized")
 
     if leave_request.status == LeaveStatus.CANCEL_PENDING:
@@ -557,6 +657,7 @@ async def reject_request(
     else:
         leave_request.status = LeaveStatus.REJECTED
         
+    bump_tenant_version(db, requester.email.split("@")[-1])
     db.commit()
     db.refresh(leave_request)
 
@@ -600,6 +701,27 @@ def update_user_entitlement(
     db.refresh(entitlement)
     return entitlement
 
+@router.post("/admin/rollover")
+def rollover_tenant_entitlements(
+    year: Optional[int] = None,
+    carry_over_max: Optional[float] = Query(None, ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Create entitlements for the given year (default: next year) for the whole tenant.
+    Optionally carries over up to `carry_over_max` remaining days from the previous year.
+    Safe to run repeatedly - existing entitlements are left untouched.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from app.logic.rollover import rollover_entitlements
+
+    target_year = year if year else datetime.utcnow().year + 1
+    domain = current_user.email.split("@")[-1]
+    return rollover_entitlements(db, target_year, domain=domain, carry_over_max=carry_over_max)
+
 @router.get("/admin/{user_id}/entitlement", response_model=LeaveEntitlementRead)
 def get_user_entitlement(
     user_id: UUID,
@@ -613,39 +735,296 @@ def get_user_entitlement(
     if not entitlement:
          return LeaveEntitlementRead(id=0, user_id=user_id, year=current_year, total_days=20.0, remaining_days=20.0)
     return entitlement
-@router.get("/calendar", response_model=List[LeaveRequestRead])
+
+
+_COMPACT_LEAVE_COLUMNS = (
+    LeaveRequest.id,
+    LeaveRequest.user_id,
+    LeaveRequest.start_date,
+    LeaveRequest.end_date,
+    LeaveRequest.start_half_day,
+    LeaveRequest.end_half_day,
+    LeaveRequest.days_count,
+    LeaveRequest.status,
+    LeaveRequest.note,
+    LeaveRequest.created_at,
+)
+_COMPACT_USER_COLUMNS = (
+    User.email.label("user_email"),
+    User.full_name.label("user_full_name"),
+    User.picture.label("user_picture"),
+    User.user_type.label("user_user_type"),
+)
+
+def _reassign_pending_approver(db: Session, user_id: UUID, approver_id: Optional[UUID]) -> None:
+    """Point the user's requests still awaiting approval at their new supervisor."""
+    db.execute(
+        update(LeaveRequest)
+        .where(
+            LeaveRequest.user_id == user_id,
+            pending_approval(LeaveRequest.status)
+        )
+        .values(approver_id=approver_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _compact_leave_list(
+    db: Session,
+    filters: list,
+    response: Response = None,
+    keys: tuple = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    descending: bool = False,
+    archive_since: Optional[date] = None
+) -> LeaveRequestCompactList:
+    """
+    Lean projection of leave requests joined to their users.
+    Selects plain columns (no ORM hydration) and emits each user once.
+    Optionally keyset-paginated by `keys` (see app.pagination).
+    With `archive_since`, archived rows from that date on are included (see app.logic.archive).
+    """
+    query = (
+        select(*_COMPACT_LEAVE_COLUMNS, *_COMPACT_USER_COLUMNS)
+        .join(User, LeaveRequest.user_id == User.id)
+        .where(*filters)
+    )
+    if archive_since is not None:
+        query = route_leave_query(db, query, since=archive_since)
+    rows = None
+    if keys is not None:
+        query = keyset_paginate(query, keys, cursor, limit, descending=descending)
+        rows = page_response(
+            response, db.execute(query).mappings().all(),
+            lambda r: tuple(r[k.key] for k in keys), limit
+        )
+    else:
+        rows = db.execute(query).mappings()
+
+    items = []
+    users = {}
+    for row in rows:
+        items.append(LeaveRequestCompact.model_validate(row))
+        if row["user_id"] not in users:
+            users[row["user_id"]] = UserSummary(
+                id=row["user_id"],
+                email=row["user_email"],
+                full_name=row["user_full_name"],
+                picture=row["user_picture"],
+                user_type=row["user_user_type"]
+            )
+
+    return LeaveRequestCompactList(items=items, users=users)
+
+def _default_calendar_window(today: date) -> tuple[date, date]:
+    """Visible month grid: weeks (Mon-Sun) covering the current month."""
+    month_start = today.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    month_end = next_month - timedelta(days=1)
+    window_start = month_start - timedelta(days=month_start.weekday())
+    window_end = month_end + timedelta(days=6 - month_end.weekday())
+    return window_start, window_end
+
+@router.get("/calendar", response_model=Union[List[LeaveRequestRead], LeaveRequestCompactList])
 def get_team_calendar(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    compact: bool = False,
+    etag: str = Depends(conditional_get("calendar")),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
 ):
     """
-    Get all approved leave requests for the team/tenant.
+    Get approved leave requests for the team/tenant overlapping [from, to].
+    Defaults to the visible month grid of the current month.
+    With `compact`, rows reference `user_id` and users are returned once in a separate map.
     """
+    default_from, default_to = _default_calendar_window(date.today())
+    window_from = from_date or default_from
+    window_to = to_date or default_to
+    if window_to < window_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+
     domain = current_user.email.split("@")[-1]
+    filters = [
+        User.email.like(f"%@{domain}"),
+        LeaveRequest.status.in_([LeaveStatus.APPROVED, LeaveStatus.CANCEL_PENDING]),
+        # Overlap predicate, served by ix_leave_requests_start_end
+        LeaveRequest.start_date <= window_to,
+        LeaveRequest.end_date >= window_from
+    ]
+
+    version = current_tenant_version(request, db, domain)
+    cache_key = ("calendar", domain, version, window_from, window_to, compact)
+
+    if compact:
+        return cached_json_response(
+            cache_key, response,
+            lambda: Response(
+                content=_compact_leave_list(db, filters, archive_since=window_from).model_dump_json(),
+                media_type="application/json",
+                headers=response.headers
+            )
+        )
     
-    query = (
-        select(LeaveRequest)
-        .join(User)
+    def build():
+        # Fast path: Core rows -> prebuilt TypeAdapter -> orjson
+        query = (
+            select(*LEAVE_READ_COLUMNS, *LEAVE_USER_COLUMNS)
+            .join(User, LeaveRequest.user_id == User.id)
+            .where(*filters)
+        )
+        # Past windows transparently read archived years too
+        query = route_leave_query(db, query, since=window_from)
+        rows = db.execute(query).mappings().all()
+        return fast_json_response(LEAVE_REQUEST_LIST, leave_rows_with_user(rows), headers=response.headers)
+
+    return cached_json_response(cache_key, response, build)
+
+@router.get("/team/balances", response_model=List[TeamBalanceRead])
+def get_team_balances(
+    year: int = None,
+    prorate_join_date: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
+):
+    """
+    Leave balances for every user the current user manages, in one response.
+    Admins get all active users in their domain, supervisors their subordinates.
+    Built from a handful of aggregate queries instead of per-user calls.
+    Missing entitlements are reported with tenant defaults but not created.
+    With `prorate_join_date`, accrual of users who joined during the year starts on their join date.
+    """
+    from app.models import Tenant
+
+    target_year = year if year else datetime.utcnow().year
+    domain = current_user.email.split("@")[-1]
+    start_of_year = date(target_year, 1, 1)
+    end_of_year = date(target_year, 12, 31)
+    today = date.today()
+
+    # 1. Managed users with their entitlement for the year
+    users_query = (
+        select(User, LeaveEntitlement)
+        .outerjoin(
+            LeaveEntitlement,
+            and_(LeaveEntitlement.user_id == User.id, LeaveEntitlement.year == target_year)
+        )
+        .where(User.is_active.is_(True))
+        .order_by(User.full_name.asc())
+    )
+    if current_user.is_admin:
+        users_query = users_query.where(User.email.like(f"%@{domain}"))
+    else:
+        users_query = users_query.where(User.supervisor_id == current_user.id)
+
+    rows = db.execute(users_query).all()
+    if not rows:
+        return []
+    user_ids = [u.id for u, _ in rows]
+
+    # 2. Per-user totals
+    in_year = and_(LeaveRequest.start_date >= start_of_year, LeaveRequest.start_date <= end_of_year)
+    totals = {
+        row.user_id: row
+        for row in db.execute(route_leave_query(
+            db,
+            select(
+                LeaveRequest.user_id,
+                func.sum(case(
+                    (and_(in_year, LeaveRequest.status.in_([LeaveStatus.APPROVED, LeaveStatus.CANCEL_PENDING])), LeaveRequest.days_count),
+                    else_=0
+                )).label("used_days"),
+                func.sum(case(
+                    (and_(in_year, LeaveRequest.status == LeaveStatus.PENDING), LeaveRequest.days_count),
+                    else_=0
+                )).label("pending_days"),
+                func.sum(case((LeaveRequest.status == LeaveStatus.PENDING, 1), else_=0)).label("pending_count"),
+            )
+            .where(LeaveRequest.user_id.in_(user_ids))
+            .group_by(LeaveRequest.user_id),
+            since=start_of_year
+        )).all()
+    }
+
+    # 3. Next upcoming leave per user
+    next_start = (
+        select(LeaveRequest.user_id, func.min(LeaveRequest.start_date).label("start_date"))
         .where(
-            User.email.like(f"%@{domain}"),
-            LeaveRequest.status.in_([LeaveStatus.APPROVED, LeaveStatus.CANCEL_PENDING])
+            LeaveRequest.user_id.in_(user_ids),
+            LeaveRequest.status.in_([LeaveStatus.APPROVED, LeaveStatus.PENDING]),
+            LeaveRequest.start_date >= today
         )
-        .options(joinedload(LeaveRequest.user))
+        .group_by(LeaveRequest.user_id)
+        .subquery()
+    )
+    next_leaves = {}
+    for user_id, start, end in db.execute(
+        select(LeaveRequest.user_id, LeaveRequest.start_date, func.max(LeaveRequest.end_date))
+        .join(next_start, and_(
+            next_start.c.user_id == LeaveRequest.user_id,
+            next_start.c.start_date == LeaveRequest.start_date
+        ))
+        .where(LeaveRequest.status.in_([LeaveStatus.APPROVED, LeaveStatus.PENDING]))
+        .group_by(LeaveRequest.user_id, LeaveRequest.start_date)
+    ).all():
+        next_leaves[user_id] = (start, end)
+
+    # 4. Tenant default for users without an entitlement yet
+    tenant = db.scalar(select(Tenant).where(Tenant.domain == domain))
+    default_days = float(tenant.default_vacation_days) if tenant else 20.0
+
+    total_days_list = [float(e.total_days) if e else default_days for _, e in rows]
+    accruals = compute_accruals(
+        total_days_list,
+        target_year,
+        user_types=[u.user_type for u, _ in rows],
+        join_dates=[u.created_at for u, _ in rows] if prorate_join_date else None
     )
-    
-    requests = db.scalars(query).all()
-    return requests
+
+    balances = []
+    for (user, entitlement), total_days, accrued_days in zip(rows, total_days_list, accruals):
+        agg = totals.get(user.id)
+        used_days = float(agg.used_days or 0) if agg else 0.0
+        if entitlement:
+            remaining_days = float(entitlement.remaining_days)
+        else:
+            remaining_days = default_days - used_days
+        next_start_date, next_end_date = next_leaves.get(user.id, (None, None))
+
+        balances.append(TeamBalanceRead(
+            user=user,
+            year=target_year,
+            entitlement_id=entitlement.id if entitlement else None,
+            total_days=total_days,
+            remaining_days=remaining_days,
+            accrued_days=accrued_days,
+            used_days=used_days,
+            pending_days=float(agg.pending_days or 0) if agg else 0.0,
+            pending_count=int(agg.pending_count or 0) if agg else 0,
+            next_leave_start=next_start_date,
+            next_leave_end=next_end_date
+        ))
+
+    return balances
 
 @router.get("/admin/users/{user_id}/leaves", response_model=List[LeaveRequestRead])
 def get_user_leave_history(
     user_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
 ):
     """
     Get leave history for a specific user.
     Admin can see anyone in their domain.
-    Supervisor can see their subordinates.
+    Supervisors can see their direct and indirect reports.
+    Pass `limit` to page through it, following the X-Next-Cursor header.
     """
     target_user = db.get(User, user_id)
     if not target_user:
@@ -653,7 +1032,7 @@ def get_user_leave_history(
         
     # Permission check
     is_admin = current_user.is_admin
-    is_supervisor = target_user.supervisor_id == current_user.id
+    is_supervisor = is_manager_of(db, current_user.id, target_user.id)
     
     # Domain check for admin
     current_domain = current_user.email.split("@")[-1]
@@ -665,14 +1044,11 @@ def get_user_leave_history(
     if is_admin and current_domain != target_domain:
          raise HTTPException(status_code=403, detail="Forbidden - cross-domain access")
 
-    query = (
-        select(LeaveRequest)
-        .where(LeaveRequest.user_id == user_id)
-        .order_by(LeaveRequest.start_date.desc())
-    )
+    query = select(LeaveRequest).where(LeaveRequest.user_id == user_id)
+    query = keyset_paginate(query, _START_KEYS, cursor, limit, descending=True)
     
-    requests = db.scalars(query).all()
-    return requests
+    requests = db.scalars(route_leave_entities(db, query)).all()
+    return page_response(response, requests, _start_key, limit)
 
 @router.get("/admin/users/{user_id}/entitlement", response_model=LeaveEntitlementRead)
 def get_user_entitlement_stats(
@@ -691,7 +1067,7 @@ def get_user_entitlement_stats(
         
     # Permission check (reuse logic)
     is_admin = current_user.is_admin
-    is_supervisor = target_user.supervisor_id == current_user.id
+    is_supervisor = is_manager_of(db, current_user.id, target_user.id)
     current_domain = current_user.email.split("@")[-1]
     target_domain = target_user.email.split("@")[-1]
 
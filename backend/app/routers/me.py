@@ -0,0 +1,63 @@
+from datetime import datetime, date
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from sqlalchemy import select, desc, func
+
+from app.auth_deps import get_db, get_current_user
+from app.models import User, LeaveRequest, pending_approval
+from app.schemas import DashboardRead
+from app.routers.leaves import _get_or_create_entitlement
+from app.logic.archive import route_leave_entities
+
+router = APIRouter(prefix="/me", tags=["me"])
+
+
+@router.get("/dashboard", response_model=DashboardRead)
+def get_my_dashboard(
+    year: int = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Everything the dashboard needs on page load in one response:
+    current user, entitlement with accrual, my requests starting in the
+    year or later (the page shows the year, plus next-year and upcoming
+    leave hints) and the number of requests waiting for my approval.
+    """
+    target_year = year if year else datetime.utcnow().year
+
+    entitlement = _get_or_create_entitlement(db, current_user, target_year)
+
+    requests = db.scalars(route_leave_entities(
+        db,
+        select(LeaveRequest)
+        .where(
+            LeaveRequest.user_id == current_user.id,
+            LeaveRequest.start_date >= date(target_year, 1, 1)
+        )
+        .order_by(desc(LeaveRequest.created_at)),
+        since=date(target_year, 1, 1)
+    )).all()
+
+    # Same scope as /leaves/approvals, but only counted
+    domain = current_user.email.split("@")[-1]
+    approvals_query = (
+        select(func.count(LeaveRequest.id))
+        .join(User, LeaveRequest.user_id == User.id)
+        .where(
+            User.email.like(f"%@{domain}"),
+            pending_approval(LeaveRequest.status)
+        )
+    )
+    if not current_user.is_admin:
+        approvals_query = approvals_query.where(LeaveRequest.approver_id == current_user.id)
+    pending_approvals = db.scalar(approvals_query) or 0
+
+    return DashboardRead(
+        user=current_user,
+        year=target_year,
+        entitlement=entitlement,
+        requests=requests,
+        pending_approvals=pending_approvals
+    )
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app import models
+from app.auth_deps import require_admin
+from app.config import settings
+from app.profiling import loop_lag, start_tracemalloc, stop_tracemalloc, take_snapshot
+
+
+def _profiling_enabled():
+    if not settings.profiling_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+router = APIRouter(
+    prefix="/admin/profiling",
+    tags=["profiling"],
+    dependencies=[Depends(_profiling_enabled)],
+)
+
+
+@router.post("/tracemalloc/start")
+def tracemalloc_start(
+    frames: int = Query(10, ge=1, le=50),
+    admin: models.User = Depends(require_admin),
+):
+    """Start tracing allocations in this worker (adds memory/CPU overhead until stopped)."""
+    start_tracemalloc(frames)
+    return {"tracing": True, "frames": frames}
+
+
+@router.post("/tracemalloc/snapshot")
+def tracemalloc_snapshot(
+    limit: int = Query(25, ge=1, le=200),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    admin: models.User = Depends(require_admin),
+):
+    """
+    Top allocation sites now, plus the growth since the previous snapshot.
+    Take one, exercise the suspect endpoint, take another.
+    """
+    return take_snapshot(limit=limit, group_by=group_by)
+
+
+@router.post("/tracemalloc/stop")
+def tracemalloc_stop(admin: models.User = Depends(require_admin)):
+    stop_tracemalloc()
+    return {"tracing": False}
+
+
+@router.get("/loop-lag")
+def event_loop_lag(admin: models.User = Depends(require_admin)):
+    """How late the event loop runs scheduled callbacks (blocking work on the loop)."""
+    return loop_lag.stats()
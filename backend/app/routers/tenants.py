@@ -1,17 +1,23 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 
-from app.auth_deps import get_db, get_current_user
+from app.auth_deps import get_db, get_read_db, get_current_user, get_current_reader, require_admin
+from app.etag import bump_tenant_version, conditional_get
 from app.models import User, Tenant
 from app.schemas import TenantRead, TenantUpdate
+from app.rate_limit import rate_limit
+
+logger = logging.getLogger("offdays")
 
 router = APIRouter(prefix="/tenants", tags=["tenants"])
 
 @router.get("/me", response_model=TenantRead)
 def get_my_tenant(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    etag: str = Depends(conditional_get("tenant")),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
 ):
     """
     Get current tenant settings. (For now assuming single tenant or domain matched).
@@ -92,6 +98,7 @@ def update_my_tenant(
                 ent.remaining_days += diff
                 db.add(ent)
         
+    bump_tenant_version(db, tenant.domain)
     db.commit()
     db.refresh(tenant)
     
@@ -111,18 +118,22 @@ def update_my_tenant(
     tenant_data.service_account_email = service_account_email
     return tenant_data
 
-@router.post("/me/sync")
+@router.post(
+    "/me/sync",
+    # Admin check first: requests it rejects must not spend the tenant's tokens
+    dependencies=[
+        Depends(require_admin),
+        Depends(rate_limit("tenant_sync", per_user="5/minute", per_tenant="20/hour")),
+    ],
+)
 async def sync_all_to_shared_calendar(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_admin)
 ):
     """
     Force sync all approved leave requests to the shared calendar.
     Admin only.
     """
-    if not current_user.is_admin:
-        raise HTTPException(status_code=403, detail="Admin access required")
-
     domain = current_user.email.split("@")[-1]
     tenant = db.scalar(select(Tenant).where(Tenant.domain == domain))
     if not tenant: tenant = db.scalar(select(Tenant))
@@ -174,7 +185,7 @@ async def sync_all_to_shared_calendar(
                     sync_count += 1
                 except Exception as e:
                     catch_err = str(e)
-                    print(f"Error creating sync for request {req.id}: {catch_err}")
+                    logger.warning(f"Error creating sync for request {req.id}: {catch_err}")
                     if not first_error: first_error = catch_err
                     errors += 1
         
@@ -191,9 +202,11 @@ async def sync_all_to_shared_calendar(
                     db.add(req)
                     cleanup_count += 1
                 except Exception as e:
-                    print(f"Error cleaning up sync for request {req.id}: {e}")
+                    logger.warning(f"Error cleaning up sync for request {req.id}: {e}")
                     # We don't block on cleanup errors (e.g. if event already manually deleted)
 
+    if sync_count or cleanup_count:
+        bump_tenant_version(db, tenant.domain)
     db.commit()
     return {
         "synchronized": sync_count,
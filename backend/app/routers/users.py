@@ -1,16 +1,39 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app import models
 from app.schemas import UserRead, UserUpdate, UserCreate
-from app.auth_deps import get_db, require_admin, get_current_user
+from app.auth_deps import get_db, get_read_db, require_admin, require_admin_reader, get_current_reader
+from app.etag import bump_tenant_version, conditional_get
+from app.cache import cached_json_response, current_tenant_version
 
 from app.billing.manager import SubscriptionManager
+from app.routers.leaves import _reassign_pending_approver
+from app.logic.hierarchy import set_supervisor, subtree_user_ids, would_create_cycle
+from app.pagination import keyset_paginate, page_response, MAX_PAGE_SIZE
+from app.serialization import USER_LIST, USER_READ_COLUMNS, fast_json_response
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# Keyset sort key for user lists: name, then id as tie-breaker.
+# NULL names sort as "" so the order is identical on SQLite and Postgres.
+_NAME_KEYS = (func.coalesce(models.User.full_name, ""), models.User.id)
+
+
+def _name_row_key(r):
+    return (r["full_name"] or "", r["id"])
+
+
+def _user_list_response(db: Session, query, response: Response, cursor: Optional[str], limit: Optional[int]):
+    """Run a paginated Core user query and render it on the fast path."""
+    query = keyset_paginate(query, _NAME_KEYS, cursor, limit)
+    rows = page_response(response, db.execute(query).mappings().all(), _name_row_key, limit)
+    return fast_json_response(USER_LIST, rows, headers=response.headers)
+
 
 @router.post("", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 def create_user(
@@ -59,6 +82,7 @@ def create_user(
         user_type=payload.user_type
     )
     db.add(new_user)
+    bump_tenant_version(db, admin_domain)
     db.commit()
     db.refresh(new_user)
     
@@ -72,60 +96,86 @@ def create_user(
 
 @router.get("/all", response_model=list[UserRead])
 def list_users_for_sharing(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    etag: str = Depends(conditional_get("users_all")),
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_reader),
 ):
     """
     Returns a list of all active users.
     Used by the password sharing dialog.
     Available to any authenticated user.
+    Pass `limit` to page through them, following the X-Next-Cursor header.
     """
     # Filter users to only show those from the same domain as the current user
     current_domain = current_user.email.split("@")[-1]
     
-    users = (
-        db.query(models.User)
-        .filter(
+    query = (
+        select(*USER_READ_COLUMNS)
+        .where(
             models.User.is_active.is_(True),
             models.User.email.like(f"%@{current_domain}")
         )
-        .order_by(models.User.full_name.asc())
-        .all()
     )
-    return users
+    version = current_tenant_version(request, db, current_domain)
+    cache_key = ("users_all", current_domain, version, cursor, limit)
+    return cached_json_response(
+        cache_key, response,
+        lambda: _user_list_response(db, query, response, cursor, limit)
+    )
 
 
 @router.get("/managed", response_model=list[UserRead])
 def list_managed_users(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    subtree: bool = False,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    etag: str = Depends(conditional_get("users_managed")),
+    db: Session = Depends(get_read_db),
+    current_user: models.User = Depends(get_current_reader),
 ):
     """
     Returns users the current user can manage/view leaves for.
-    Admins get all in domain, supervisors get subordinates.
+    Admins get all in domain, supervisors get subordinates
+    (with `subtree`, their indirect reports as well).
+    Pass `limit` to page through them, following the X-Next-Cursor header.
     """
     domain = current_user.email.split("@")[-1]
     
     if current_user.is_admin:
-        return (
-            db.query(models.User)
-            .filter(
+        query = (
+            select(*USER_READ_COLUMNS)
+            .where(
                 models.User.email.like(f"%@{domain}"),
                 models.User.is_active.is_(True)
             )
-            .order_by(models.User.full_name.asc())
-            .all()
         )
-    
-    # Not admin, check subordinates
-    return (
-        db.query(models.User)
-        .filter(
-            models.User.supervisor_id == current_user.id,
-            models.User.is_active.is_(True)
+        scope = "all"
+    else:
+        # Not admin, check subordinates
+        if subtree:
+            managed = models.User.id.in_(subtree_user_ids(current_user.id))
+        else:
+            managed = models.User.supervisor_id == current_user.id
+        query = (
+            select(*USER_READ_COLUMNS)
+            .where(
+                managed,
+                models.User.is_active.is_(True)
+            )
         )
-        .order_by(models.User.full_name.asc())
-        .all()
+        scope = (current_user.id, subtree)
+
+    version = current_tenant_version(request, db, domain)
+    cache_key = ("users_managed", domain, version, scope, cursor, limit)
+    return cached_json_response(
+        cache_key, response,
+        lambda: _user_list_response(db, query, response, cursor, limit)
     )
 
 # --- Admin-only user management ---
@@ -133,19 +183,21 @@ def list_managed_users(
 
 @router.get("", response_model=list[UserRead])
 def list_users(
-    db: Session = Depends(get_db),
-    admin: models.User = Depends(require_admin),
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
+    admin: models.User = Depends(require_admin_reader),
 ):
     # Admin sees only users in their domain
     admin_domain = admin.email.split("@")[-1]
     
-    users = (
-        db.query(models.User)
-        .filter(models.User.email.like(f"%@{admin_domain}"))
-        .order_by(models.User.full_name.asc())
-        .all()
+    # Fast path: Core rows -> prebuilt TypeAdapter -> orjson
+    query = (
+        select(*USER_READ_COLUMNS)
+        .where(models.User.email.like(f"%@{admin_domain}"))
     )
-    return users
+    return _user_list_response(db, query, response, cursor, limit)
 
 
 @router.get("/{user_id}", response_model=UserRead)
@@ -244,14 +296,20 @@ def update_user(
             supervisor = db.get(models.User, sup_id)
             if not supervisor:
                  raise HTTPException(status_code=400, detail="Supervisor not found")
-            # Prevent circular or self supervision?
             if supervisor.id == user.id:
                 raise HTTPException(status_code=400, detail="User cannot be their own supervisor")
-        user.supervisor_id = sup_id
+            if supervisor.email.split("@")[-1] != admin_domain:
+                raise HTTPException(status_code=400, detail="Supervisor not found")
+            if would_create_cycle(db, user.id, sup_id):
+                raise HTTPException(status_code=400, detail="Supervisor is already managed by this user")
+        if sup_id != user.supervisor_id:
+            _reassign_pending_approver(db, user.id, sup_id)
+            set_supervisor(db, user, sup_id)
 
     if "user_type" in update_data:
         user.user_type = update_data["user_type"]
 
+    bump_tenant_version(db, admin_domain)
     db.commit()
     db.refresh(user)
 
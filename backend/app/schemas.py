@@ -89,6 +89,19 @@ class LeaveEntitlementRead(LeaveEntitlementBase, ORMModel):
     user_id: UUID
     accrued_days: float = 0.0
 
+class TeamBalanceRead(BaseModel):
+    user: UserRead
+    year: int
+    entitlement_id: Optional[int] = None
+    total_days: float
+    remaining_days: float
+    accrued_days: float = 0.0
+    used_days: float = 0.0      # approved + cancel_pending in the year
+    pending_days: float = 0.0   # pending in the year
+    pending_count: int = 0
+    next_leave_start: Optional[date] = None
+    next_leave_end: Optional[date] = None
+
 class LeaveEntitlementUpdate(BaseModel):
     total_days: Optional[float] = None
     remaining_days: Optional[float] = None
@@ -118,6 +131,38 @@ class LeaveRequestRead(LeaveRequestBase, ORMModel):
     user: Optional[UserRead] = None
 
 
+
+# Compact list mode: rows reference user_id, users are sent once
+class UserSummary(BaseModel):
+    id: UUID
+    email: str
+    full_name: Optional[str] = None
+    picture: Optional[str] = None
+    user_type: UserType = UserType.EMPLOYEE
+
+class LeaveRequestCompact(BaseModel):
+    id: UUID
+    user_id: UUID
+    start_date: date
+    end_date: date
+    start_half_day: bool = False
+    end_half_day: bool = False
+    days_count: float
+    status: LeaveStatus
+    note: Optional[str] = None
+    created_at: datetime
+
+class LeaveRequestCompactList(BaseModel):
+    items: List[LeaveRequestCompact] = []
+    users: Dict[UUID, UserSummary] = {}
+
+class DashboardRead(BaseModel):
+    user: UserRead
+    year: int
+    entitlement: LeaveEntitlementRead
+    requests: List[LeaveRequestRead] = []
+    pending_approvals: int = 0
+
 # --- Billing (Kept simplified placeholders if needed by other parts, or assume kept from cleanup) --
 # Assuming SubscriptionRead might be needed if I didn't verify use in users.py or main.py 
 # but previous list_dir showed billing.py was there, checking dependencies...
@@ -0,0 +1,72 @@
+from typing import Any, Iterable, List, Mapping
+
+import orjson
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+from app.models import User, LeaveRequest
+from app.schemas import LeaveRequestRead, UserRead
+
+
+# Built once at import; building adapters per request is a large part of their cost
+LEAVE_REQUEST_LIST = TypeAdapter(List[LeaveRequestRead])
+USER_LIST = TypeAdapter(List[UserRead])
+
+# Plain columns matching the Read schemas, for selecting Core rows instead of ORM objects
+USER_READ_COLUMNS = (
+    User.id,
+    User.email,
+    User.full_name,
+    User.is_admin,
+    User.is_active,
+    User.user_type,
+    User.created_at,
+    User.picture,
+    User.last_login,
+    User.supervisor_id,
+)
+LEAVE_READ_COLUMNS = (
+    LeaveRequest.id,
+    LeaveRequest.user_id,
+    LeaveRequest.start_date,
+    LeaveRequest.end_date,
+    LeaveRequest.note,
+    LeaveRequest.start_half_day,
+    LeaveRequest.end_half_day,
+    LeaveRequest.days_count,
+    LeaveRequest.status,
+    LeaveRequest.gcal_event_id,
+    LeaveRequest.created_at,
+)
+# Same user columns, prefixed so they can be selected next to a leave request
+LEAVE_USER_COLUMNS = tuple(c.label(f"user_{c.key}") for c in USER_READ_COLUMNS)
+
+_LEAVE_KEYS = tuple(c.key for c in LEAVE_READ_COLUMNS)
+_LEAVE_USER_KEYS = tuple((f"user_{c.key}", c.key) for c in USER_READ_COLUMNS)
+
+
+class ORJSONResponse(Response):
+    """JSON response rendered with orjson (handles UUID/datetime/date natively)."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def leave_rows_with_user(rows: Iterable[Mapping]) -> list[dict]:
+    """Nest the `user_*` columns of joined Core rows into a `user` dict."""
+    result = []
+    for row in rows:
+        item = {k: row[k] for k in _LEAVE_KEYS}
+        item["user"] = {key: row[label] for label, key in _LEAVE_USER_KEYS}
+        result.append(item)
+    return result
+
+
+def fast_json_response(adapter: TypeAdapter, data: Any, headers: Mapping[str, str] = None) -> Response:
+    """
+    Validate `data` with a prebuilt TypeAdapter and render it with orjson.
+    Returning a Response skips FastAPI's own response_model pass.
+    """
+    validated = adapter.validate_python(data)
+    return ORJSONResponse(adapter.dump_python(validated), headers=dict(headers) if headers else None)
@@ -52,6 +52,22 @@ def seed_plans(db: Session):
         traceback.print_exc()
         db.rollback()
 
+def seed_user_hierarchy(db: Session):
+    """
+    Fill the supervisor closure table if it is empty but supervisors are set
+    (databases created by create_all() before the table existed).
+    """
+    from .logic.hierarchy import rebuild_hierarchy
+
+    try:
+        has_rows = db.query(models.UserHierarchy).first() is not None
+        has_supervisors = db.query(models.User).filter(models.User.supervisor_id.isnot(None)).first() is not None
+        if not has_rows and has_supervisors:
+            print(f"🌱 Seeding user hierarchy: {rebuild_hierarchy(db)} rows")
+    except Exception as e:
+        print(f"❌ Error seeding user hierarchy: {e}")
+        db.rollback()
+
 def seed_initial_data(engine: Engine):
     """
     Seed initial data (Plans, etc.) into the database.
@@ -67,6 +83,7 @@ def seed_initial_data(engine: Engine):
     db = SessionLocal()
     try:
         seed_plans(db)
+        seed_user_hierarchy(db)
     finally:
         db.close()
 
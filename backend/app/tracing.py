@@ -0,0 +1,316 @@
+"""
+Lightweight request tracing: nested spans around DB, Google API and SMTP work.
+
+Enabled with TRACING_EXPORTER=memory|file|otlp. A root span is opened per
+request by `TracingMiddleware` (sampled at TRACING_SAMPLE_RATE); `span()` opens
+children, and every SQL statement run inside a sampled trace becomes a
+"db.query" span. Finished traces go to the configured exporter:
+
+- memory: last traces kept in `memory_exporter.traces` (tests, debugging)
+- file:   one JSON line per trace in TRACING_FILE, for offline analysis
+- otlp:   OTLP/HTTP JSON to TRACING_OTLP_ENDPOINT (collector, Cloud Trace, Jaeger)
+"""
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger("offdays.tracing")
+
+SERVICE_NAME = "offdays-backend"
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes",
+                 "start_ns", "end_ns", "error", "_trace")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], trace: List["Span"], attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+        self._trace = trace
+        trace.append(self)
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+# Current span of this request / task; None when not traced or not sampled
+_current: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+
+
+# --- Exporters ---
+
+class InMemoryExporter:
+    """Keeps the last `maxlen` traces as lists of span dicts."""
+
+    def __init__(self, maxlen: int = 100):
+        self.traces: Deque[List[Dict[str, Any]]] = deque(maxlen=maxlen)
+
+    def export(self, spans: List[Span]) -> None:
+        self.traces.append([s.to_dict() for s in spans])
+
+
+class JsonFileExporter:
+    """Appends one JSON line per trace."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        line = json.dumps({"spans": [s.to_dict() for s in spans]}, default=str)
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpHttpExporter:
+    """
+    OTLP/HTTP with JSON encoding (POST {endpoint}/v1/traces).
+    Traces are sent from a background thread; when the queue is full they are dropped.
+    """
+
+    def __init__(self, endpoint: str, max_queue: int = 1000):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self._queue: "queue.Queue[List[Span]]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, spans: List[Span]) -> None:
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            pass
+
+    def _payload(self, batch: List[List[Span]]) -> Dict[str, Any]:
+        spans = []
+        for trace in batch:
+            for s in trace:
+                item = {
+                    "traceId": s.trace_id,
+                    "spanId": s.span_id,
+                    "name": s.name,
+                    "kind": 2 if s is trace[0] else 1,
+                    "startTimeUnixNano": str(s.start_ns),
+                    "endTimeUnixNano": str(s.end_ns),
+                    "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                    "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+                }
+                if s.parent_id:
+                    item["parentSpanId"] = s.parent_id
+                spans.append(item)
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "offdays"}, "spans": spans}],
+        }]}
+
+    def _run(self) -> None:
+        with httpx.Client(timeout=5.0) as client:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < 50:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                try:
+                    client.post(self.url, json=self._payload(batch))
+                except Exception as e:
+                    logger.warning(f"⚠️ OTLP export failed: {e}")
+
+
+memory_exporter = InMemoryExporter()
+
+
+def _build_exporter():
+    kind = settings.tracing_exporter
+    if kind == "memory":
+        return memory_exporter
+    if kind == "file":
+        return JsonFileExporter(settings.tracing_file)
+    if kind == "otlp":
+        return OtlpHttpExporter(settings.tracing_otlp_endpoint)
+    return None
+
+
+_exporter = _build_exporter()
+
+
+def set_exporter(exporter) -> None:
+    """Swap the exporter (tests, or tools analysing traces in-process)."""
+    global _exporter
+    _exporter = exporter
+
+
+# --- Spans ---
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Child span of the current one. Does nothing (yields None) outside a
+    sampled trace, so it is cheap to leave in hot paths.
+    """
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, parent.trace_id, parent.span_id, parent._trace, attributes)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = repr(e)
+        raise
+    finally:
+        child.end_ns = time.time_ns()
+        _current.reset(token)
+
+
+@contextmanager
+def root_span(name: str, traceparent: Optional[str] = None, **attributes):
+    """
+    Start a trace (subject to sampling) and export it when the block ends.
+    `traceparent` (W3C header) continues an upstream trace.
+    """
+    if _exporter is None or random.random() >= settings.tracing_sample_rate:
+        yield None
+        return
+
+    trace_id, parent_id = os.urandom(16).hex(), None
+    if traceparent:
+        parts = traceparent.split("-")
+        if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16:
+            trace_id, parent_id = parts[1], parts[2]
+
+    trace: List[Span] = []
+    root = Span(name, trace_id, parent_id, trace, attributes)
+    token = _current.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.error = repr(e)
+        raise
+    finally:
+        root.end_ns = time.time_ns()
+        _current.reset(token)
+        try:
+            _exporter.export(trace)
+        except Exception as e:
+            logger.warning(f"⚠️ Trace export failed: {e}")
+
+
+# --- SQL statements as spans ---
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = _current.get()
+    if parent is None:
+        return
+    s = Span("db.query", parent.trace_id, parent.span_id, parent._trace,
+             {"db.statement": " ".join(statement.split())[:300]})
+    conn.info.setdefault("trace_spans", []).append(s)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans and _current.get() is not None:
+        spans.pop().end_ns = time.time_ns()
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    spans = conn.info.get("trace_spans") if conn is not None else None
+    if spans and _current.get() is not None:
+        s = spans.pop()
+        s.error = repr(exception_context.original_exception)
+        s.end_ns = time.time_ns()
+
+
+# --- HTTP ---
+
+class TracingMiddleware:
+    """Root span per request (installed only when TRACING_EXPORTER is set)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        with root_span(
+            f"{method} {scope['path']}",
+            traceparent=Headers(scope=scope).get("traceparent"),
+            **{"http.method": method},
+        ) as root:
+            if root is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    root.set("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    root.name = f"{method} {route}"
+                    root.set("http.route", route)
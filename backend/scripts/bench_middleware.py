@@ -0,0 +1,110 @@
+"""
+Benchmark of the middleware stack (run from backend/):
+
+    python -m scripts.bench_middleware [requests]
+
+Per-request overhead of the BaseHTTPMiddleware stack against the pure-ASGI
+middlewares of app.middleware, driven in-process (no sockets), and how many
+chunks of a streaming response get through each.
+"""
+import asyncio
+import sys
+import time
+
+from slowapi import Limiter
+from slowapi.middleware import SlowAPIASGIMiddleware, SlowAPIMiddleware
+from slowapi.util import get_remote_address
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.middleware import SECURITY_HEADERS, SecurityHeadersMiddleware
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for name, value in SECURITY_HEADERS:
+            response.headers[name] = value
+        return response
+
+
+async def ok(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def stream(request):
+    async def chunks():
+        for i in range(20):
+            yield f"{i},".encode()
+    return StreamingResponse(chunks(), media_type="text/csv")
+
+
+def build(middleware):
+    app = Starlette(routes=[Route("/", ok), Route("/stream", stream)], middleware=middleware)
+    app.state.limiter = Limiter(key_func=get_remote_address)
+    return app
+
+
+async def call(app, path):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+    body_messages = 0
+    received = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()  # like a server: nothing more until the client goes away
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal body_messages
+        if message["type"] == "http.response.body" and message.get("body"):
+            body_messages += 1
+
+    await app(scope, receive, send)
+    return body_messages
+
+
+async def bench(app, n):
+    for _ in range(200):
+        await call(app, "/")
+    started = time.perf_counter()
+    for _ in range(n):
+        await call(app, "/")
+    return (time.perf_counter() - started) / n
+
+
+async def main(n: int = 5000):
+    stacks = {
+        "no middleware": build([]),
+        "BaseHTTPMiddleware (before)": build([
+            Middleware(SlowAPIMiddleware), Middleware(LegacySecurityHeadersMiddleware),
+        ]),
+        "pure ASGI (after)": build([
+            Middleware(SlowAPIASGIMiddleware), Middleware(SecurityHeadersMiddleware),
+        ]),
+    }
+    baseline = None
+    for name, app in stacks.items():
+        per_request = await bench(app, n)
+        baseline = baseline if baseline is not None else per_request
+        chunks = await call(app, "/stream")
+        print(
+            f"{name:30s} {per_request * 1e6:8.1f} µs/request "
+            f"(+{(per_request - baseline) * 1e6:6.1f} µs)  stream chunks seen: {chunks}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
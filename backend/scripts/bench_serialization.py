@@ -0,0 +1,73 @@
+"""
+Benchmark of the list serialization paths (run from backend/):
+
+    python -m scripts.bench_serialization [rows]
+
+Compares the ORM + response_model + default encoder path with the
+Core + TypeAdapter + orjson path of app.serialization, on in-memory SQLite.
+"""
+import sys
+import time
+import uuid
+from datetime import datetime, date, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, joinedload
+
+from app.database import Base
+from app.models import LeaveRequest, LeaveStatus, User
+from app.schemas import LeaveRequestRead
+from app.serialization import (
+    LEAVE_READ_COLUMNS,
+    LEAVE_REQUEST_LIST,
+    LEAVE_USER_COLUMNS,
+    fast_json_response,
+    leave_rows_with_user,
+)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        users = [User(id=uuid.uuid4(), email=f"user{i}@example.com", full_name=f"User {i}") for i in range(50)]
+        db.add_all(users)
+        db.flush()
+        for i in range(count):
+            start = date(2026, 1, 1) + timedelta(days=i % 300)
+            db.add(LeaveRequest(
+                user_id=users[i % len(users)].id, start_date=start, end_date=start + timedelta(days=2),
+                days_count=3, status=LeaveStatus.APPROVED, created_at=datetime.utcnow()
+            ))
+        db.commit()
+
+    def orm_path():
+        with Session(engine) as db:
+            rows = db.scalars(select(LeaveRequest).options(joinedload(LeaveRequest.user))).all()
+            # What FastAPI does with response_model + the default JSONResponse
+            validated = [LeaveRequestRead.model_validate(r) for r in rows]
+            return JSONResponse(jsonable_encoder(validated)).body
+
+    def fast_path():
+        with Session(engine) as db:
+            rows = db.execute(
+                select(*LEAVE_READ_COLUMNS, *LEAVE_USER_COLUMNS).join(User, LeaveRequest.user_id == User.id)
+            ).mappings().all()
+            return fast_json_response(LEAVE_REQUEST_LIST, leave_rows_with_user(rows)).body
+
+    for name, fn in (("orm + response_model + json", orm_path), ("core + TypeAdapter + orjson", fast_path)):
+        fn()
+        runs = 10
+        t0 = time.perf_counter()
+        for _ in range(runs):
+            body = fn()
+        elapsed = (time.perf_counter() - t0) / runs
+        print(f"{name:32s} {elapsed * 1000:8.1f} ms/request  ({count} rows, {len(body)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
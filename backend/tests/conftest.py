@@ -0,0 +1,99 @@
+"""
+Tests run against a throwaway SQLite database, with the SQL profiler and
+on-demand profiling on. The environment has to be set before anything under
+`app` is imported: settings, engines and middlewares are built at import.
+"""
+import os
+import tempfile
+import uuid
+from datetime import date, datetime, timedelta
+
+_db_file = tempfile.NamedTemporaryFile(prefix="offdays-test-", suffix=".db", delete=False)
+_db_file.close()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_file.name}"
+os.environ["QUERY_PROFILER"] = "true"
+os.environ["PROFILING_ENABLED"] = "true"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models
+from app.auth import create_access_token
+from app.database import Base, SessionLocal, engine
+from app.logic.hierarchy import set_supervisor
+
+Base.metadata.create_all(engine)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    engine.dispose()
+    os.unlink(_db_file.name)
+
+
+def seed_tenant(domain: str, users: int = 5, leaves_per_user: int = 2, supervisors: int = 1) -> dict:
+    """
+    Tenant with an admin and `users` employees reporting to `supervisors` supervisors,
+    each employee with `leaves_per_user` requests cycling through all statuses.
+    Supervisors are set through `set_supervisor`, so the closure table is filled too.
+    Returns the ids: {"admin", "supervisors", "users"}.
+    """
+    db = SessionLocal()
+    try:
+        db.add(models.Tenant(domain=domain, default_vacation_days=20))
+        admin = models.User(email=f"admin@{domain}", full_name="Admin", is_admin=True)
+        bosses = [models.User(email=f"boss{i}@{domain}", full_name=f"Boss {i}") for i in range(supervisors)]
+        db.add_all([admin, *bosses])
+        db.flush()
+
+        employees = [
+            models.User(
+                id=uuid.uuid4(),
+                email=f"user{i}@{domain}",
+                full_name=f"User {i:05d}",
+            )
+            for i in range(users)
+        ]
+        db.add_all(employees)
+        db.flush()
+        for i, user in enumerate(employees):
+            set_supervisor(db, user, bosses[i % supervisors].id)
+
+        statuses = list(models.LeaveStatus)
+        n = 0
+        for user in employees:
+            for _ in range(leaves_per_user):
+                start = date(2026, 1, 5) + timedelta(days=n % 330)
+                db.add(models.LeaveRequest(
+                    user_id=user.id,
+                    approver_id=user.supervisor_id,
+                    start_date=start,
+                    end_date=start + timedelta(days=2),
+                    days_count=3,
+                    status=statuses[n % len(statuses)],
+                    created_at=datetime(2026, 1, 1) + timedelta(minutes=n),
+                ))
+                n += 1
+        db.commit()
+        return {
+            "admin": admin.id,
+            "supervisors": [b.id for b in bosses],
+            "users": [u.id for u in employees],
+        }
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def fastapi_app():
+    from app.main import app
+    return app
+
+
+@pytest.fixture
+def client_for(fastapi_app):
+    """`client_for(user_id, domain)` -> TestClient authenticated as that user."""
+    def make(user_id, domain: str) -> TestClient:
+        client = TestClient(fastapi_app)
+        client.cookies.set("access_token", create_access_token({"sub": str(user_id), "domain": domain}))
+        return client
+    return make
@@ -0,0 +1,47 @@
+"""ETag of /billing/current follows the subscription, including a trial running out."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app import models
+from app.database import SessionLocal
+
+from conftest import seed_tenant
+
+DOMAIN = "billing.example"
+
+
+@pytest.fixture
+def admin(client_for):
+    ids = seed_tenant(DOMAIN)
+    return client_for(ids["admin"], DOMAIN)
+
+
+def _set_trial_end(when: datetime) -> None:
+    db = SessionLocal()
+    try:
+        tenant_id = db.scalar(select(models.Tenant.id).where(models.Tenant.domain == DOMAIN))
+        db.execute(update(models.Subscription).where(models.Subscription.tenant_id == tenant_id).values(trial_ends_at=when))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_trial_expiry_invalidates_etag(admin):
+    created = admin.get("/billing/current")
+    assert created.status_code == 200
+    assert created.json()["status"] == "trial"
+
+    current = admin.get("/billing/current")
+    assert current.headers["ETag"] != created.headers["ETag"]
+    assert admin.get("/billing/current", headers={"If-None-Match": current.headers["ETag"]}).status_code == 304
+
+    _set_trial_end(datetime.utcnow() - timedelta(minutes=1))
+    expired = admin.get("/billing/current", headers={"If-None-Match": current.headers["ETag"]})
+    assert expired.status_code == 200
+    assert expired.json()["status"] == "expired"
+
+    latest = admin.get("/billing/current")
+    assert latest.json()["status"] == "expired"
+    assert admin.get("/billing/current", headers={"If-None-Match": latest.headers["ETag"]}).status_code == 304
@@ -0,0 +1,116 @@
+"""
+Supervisor closure table (app.logic.hierarchy) through the routes that use it:
+reassignments from PATCH /users/{id}, cycle checks, and what indirect
+managers can see (subtree views, history) versus decide (approve / reject).
+"""
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models import LeaveRequest, LeaveStatus, UserHierarchy
+
+from conftest import seed_tenant
+
+
+@pytest.fixture
+def org(client_for):
+    """
+    admin; boss0 -> user0, user2; boss1 -> user1, user3; then boss1 moved under
+    boss0, making boss0 the grand-manager of user1 and user3.
+    """
+    domain = f"h{uuid.uuid4().hex[:8]}.example"
+    ids = seed_tenant(domain, users=4, leaves_per_user=0, supervisors=2)
+    boss0, boss1 = ids["supervisors"]
+    admin = client_for(ids["admin"], domain)
+    assert admin.patch(f"/users/{boss1}", json={"supervisor_id": str(boss0)}).status_code == 200
+    return {**ids, "domain": domain, "boss0": boss0, "boss1": boss1, "admin_client": admin}
+
+
+def _closure(*ancestors) -> dict:
+    """{ancestor: {descendant: depth}}"""
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(UserHierarchy.ancestor_id, UserHierarchy.descendant_id, UserHierarchy.depth)
+            .where(UserHierarchy.ancestor_id.in_(ancestors))
+        )
+        closure = {ancestor: {} for ancestor in ancestors}
+        for ancestor, descendant, depth in rows:
+            closure[ancestor][descendant] = depth
+        return closure
+    finally:
+        db.close()
+
+
+def _pending_request(user_id, approver_id) -> uuid.UUID:
+    db = SessionLocal()
+    try:
+        request = LeaveRequest(
+            user_id=user_id, approver_id=approver_id,
+            start_date=date(2026, 6, 1), end_date=date(2026, 6, 2),
+            days_count=2, status=LeaveStatus.PENDING,
+        )
+        db.add(request)
+        db.commit()
+        return request.id
+    finally:
+        db.close()
+
+
+def _ids(response) -> set:
+    assert response.status_code == 200
+    return {uuid.UUID(user["id"]) for user in response.json()}
+
+
+def test_reassignment_moves_whole_subtree(org):
+    users, boss0, boss1 = org["users"], org["boss0"], org["boss1"]
+    assert _closure(boss0)[boss0] == {users[0]: 1, users[2]: 1, boss1: 1, users[1]: 2, users[3]: 2}
+
+    # Move boss1's team under the admin: boss0 loses all of it
+    response = org["admin_client"].patch(f"/users/{boss1}", json={"supervisor_id": str(org["admin"])})
+    assert response.status_code == 200
+
+    closure = _closure(boss0, boss1, org["admin"])
+    assert closure[boss0] == {users[0]: 1, users[2]: 1}
+    assert closure[boss1] == {users[1]: 1, users[3]: 1}
+    assert closure[org["admin"]] == {boss1: 1, users[1]: 2, users[3]: 2}
+
+
+def test_cycle_is_rejected(org):
+    # boss0 under user1, who is already below boss0 (via boss1)
+    response = org["admin_client"].patch(f"/users/{org['boss0']}", json={"supervisor_id": str(org["users"][1])})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Supervisor is already managed by this user"
+    assert org["users"][1] in _closure(org["boss0"])[org["boss0"]]
+
+
+def test_grand_manager_sees_subtree(org, client_for):
+    users, boss1 = org["users"], org["boss1"]
+    grand = client_for(org["boss0"], org["domain"])
+
+    assert _ids(grand.get("/users/managed")) == {users[0], users[2], boss1}
+    assert _ids(grand.get("/users/managed?subtree=true")) == {users[0], users[2], boss1, users[1], users[3]}
+
+    assert grand.get(f"/leaves/admin/users/{users[1]}/leaves").status_code == 200
+    assert grand.get(f"/leaves/admin/users/{users[1]}/entitlement").status_code == 200
+    # Outside the subtree
+    other = client_for(boss1, org["domain"])
+    assert other.get(f"/leaves/admin/users/{users[0]}/leaves").status_code == 403
+
+
+def test_grand_manager_cannot_decide(org, client_for):
+    users, boss1 = org["users"], org["boss1"]
+    request_id = _pending_request(users[1], approver_id=boss1)
+
+    grand = client_for(org["boss0"], org["domain"])
+    assert request_id in {uuid.UUID(r["id"]) for r in grand.get("/leaves/approvals?subtree=true").json()}
+    assert grand.post(f"/leaves/{request_id}/reject").status_code == 403
+    assert grand.post(f"/leaves/{request_id}/approve").status_code == 403
+
+    direct = client_for(boss1, org["domain"])
+    response = direct.post(f"/leaves/{request_id}/reject")
+    assert response.status_code == 200
+    assert response.json()["status"] == LeaveStatus.REJECTED.value
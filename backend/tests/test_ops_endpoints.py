@@ -0,0 +1,53 @@
+"""/metrics and /health/db: off unless METRICS_TOKEN is set, and then behind it."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.database import engine
+
+TOKEN = "scrape-secret"
+
+
+@pytest.fixture
+def client(fastapi_app):
+    return TestClient(fastapi_app)
+
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", TOKEN)
+    return TOKEN
+
+
+@pytest.mark.parametrize("path", ["/metrics", "/health/db"])
+def test_disabled_without_token_configured(client, monkeypatch, path):
+    monkeypatch.setattr(settings, "metrics_token", "")
+    assert client.get(path).status_code == 404
+    assert client.get(path, headers={"Authorization": "Bearer "}).status_code == 404
+
+
+@pytest.mark.parametrize("path", ["/metrics", "/health/db"])
+def test_requires_bearer_token(client, metrics_token, path):
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get(path, headers={"Authorization": f"Bearer {metrics_token}"}).status_code == 200
+
+
+def test_metrics_exposition(client, metrics_token):
+    response = client.get("/metrics", headers={"Authorization": f"Bearer {metrics_token}"})
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE offdays_http_request_duration_seconds histogram" in response.text
+
+
+def test_pool_snapshot(client, metrics_token):
+    response = client.get("/health/db", headers={"Authorization": f"Bearer {metrics_token}"})
+    assert response.json()["pools"]["primary"]["checkouts"] >= 0
+
+
+def test_failed_statement_does_not_leak_query_timer():
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        assert not conn.info.get("query_metrics_start")
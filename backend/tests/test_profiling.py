@@ -0,0 +1,74 @@
+"""
+`X-Profile: cprofile` requests. From Python 3.12 cProfile is one process-wide
+profiler on sys.monitoring, so nested or concurrent profiles used to fail with
+"Another profiling tool is already active" (500); run these on 3.12 too.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import create_access_token
+from app.profiling import _profile_lock
+
+from conftest import seed_tenant
+
+DOMAIN = "profiling.example"
+PROFILE = {"X-Profile": "cprofile"}
+
+
+@pytest.fixture(scope="module")
+def tenant():
+    return seed_tenant(DOMAIN, users=10, supervisors=2)
+
+
+@pytest.fixture(scope="module")
+def started_app(fastapi_app):
+    # Startup wraps sync endpoints for profiling (profile_sync_endpoints)
+    with TestClient(fastapi_app):
+        yield fastapi_app
+
+
+def _client(app, user_id) -> TestClient:
+    client = TestClient(app)
+    client.cookies.set("access_token", create_access_token({"sub": str(user_id), "domain": DOMAIN}))
+    return client
+
+
+def test_sync_endpoint_profile(tenant, started_app):
+    response = _client(started_app, tenant["admin"]).get("/users/managed", headers=PROFILE)
+    assert response.status_code == 200
+    assert response.headers["X-Profile-Original-Status"] == "200"
+    assert response.headers["content-type"].startswith("text/plain")
+    # The endpoint body runs in a worker thread; its frames must be in the stats
+    assert "list_managed_users" in response.text
+
+
+def test_profiles_in_a_row(tenant, started_app):
+    client = _client(started_app, tenant["admin"])
+    for path in ("/users/managed", "/leaves/approvals", "/users/managed"):
+        response = client.get(path, headers=PROFILE)
+        assert response.status_code == 200, response.text
+
+
+def test_concurrent_profiles_get_409_not_500(tenant, started_app):
+    def profiled(_):
+        return _client(started_app, tenant["admin"]).get("/leaves/approvals", headers=PROFILE).status_code
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        statuses = list(pool.map(profiled, range(8)))
+    assert set(statuses) <= {200, 409}
+    assert 200 in statuses
+
+
+def test_busy_profiler(tenant, started_app):
+    with _profile_lock:
+        response = _client(started_app, tenant["admin"]).get("/users/managed", headers=PROFILE)
+    assert response.status_code == 409
+
+
+def test_non_admin_gets_normal_response(tenant, started_app):
+    response = _client(started_app, tenant["users"][0]).get("/users/managed", headers=PROFILE)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert "X-Profile-Original-Status" not in response.headers
@@ -0,0 +1,55 @@
+"""
+Query budgets (app.query_profiler.QUERY_BUDGETS) of the hot routes, measured by
+QueryProfilerMiddleware on real requests. max_repeats=0 also fails on any
+statement run twice: the N+1 signature.
+"""
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+
+from app.database import SessionLocal, engine
+from app.models import LeaveRequest, LeaveStatus
+from app.query_profiler import assert_route_budget, profile_queries
+
+from conftest import seed_tenant
+
+DOMAIN = "budgets.example"
+
+
+@pytest.fixture(scope="module")
+def tenant():
+    return seed_tenant(DOMAIN, users=40, leaves_per_user=4, supervisors=3)
+
+
+@pytest.mark.parametrize("role", ["admin", "supervisor"])
+@pytest.mark.parametrize("compact", [False, True])
+def test_approvals_inbox(tenant, client_for, role, compact):
+    user_id = tenant["admin"] if role == "admin" else tenant["supervisors"][0]
+    response = client_for(user_id, DOMAIN).get(f"/leaves/approvals?compact={str(compact).lower()}")
+    assert response.status_code == 200
+    assert response.json()
+    assert_route_budget("/leaves/approvals", max_repeats=0)
+
+
+def test_reject(tenant, client_for):
+    db = SessionLocal()
+    try:
+        request_id = db.scalar(
+            select(LeaveRequest.id)
+            .where(LeaveRequest.user_id.in_(tenant["users"]), LeaveRequest.status == LeaveStatus.PENDING)
+            .limit(1)
+        )
+    finally:
+        db.close()
+    response = client_for(tenant["admin"], DOMAIN).post(f"/leaves/{request_id}/reject")
+    assert response.status_code == 200
+    assert response.json()["status"] == LeaveStatus.REJECTED.value
+    assert_route_budget("/leaves/{request_id}/reject")
+
+
+def test_failed_statement_is_recorded_and_popped():
+    with profile_queries() as profile, engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        assert not conn.info.get("query_profiler_start")
+    assert profile.count == 1
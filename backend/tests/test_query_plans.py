@@ -0,0 +1,164 @@
+"""
+Query-plan regression tests for the hot lookups in routers/leaves.py and routers/users.py.
+
+The statements are the ones the routes actually send: each check drives a
+route (or a router helper) and EXPLAINs every statement it executed, with its
+bound parameters. A check fails on a full scan of a table with more than
+THRESHOLD rows: a plain table scan, or a scan of an index covering the whole
+table. Scanning a partial index (only pending rows, say) is fine.
+"""
+import json
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.database import Base, SessionLocal, engine
+from app.models import LeaveRequest, User, pending_approval
+from app.routers.leaves import _overlaps_user_range, _reassign_pending_approver
+
+from conftest import seed_tenant
+
+DOMAIN = "plans.example"
+THRESHOLD = 1000
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+@pytest.fixture(scope="module")
+def tenant():
+    ids = seed_tenant(DOMAIN, users=600, leaves_per_user=10, supervisors=20)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return ids
+
+
+@contextmanager
+def captured_statements():
+    """(statement, parameters) of everything executed inside the block."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(_EXPLAINABLE):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def _partial_indexes() -> set:
+    return {
+        index.name
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+        if index.dialect_options["sqlite"].get("where") is not None
+        or index.dialect_options["postgresql"].get("where") is not None
+    }
+
+
+def _full_scans(conn, statement: str, parameters) -> set:
+    """Tables the plan reads in full."""
+    if conn.dialect.name == "postgresql":
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        tables = set()
+
+        def walk(node):
+            if node.get("Node Type") == "Seq Scan":
+                tables.add(node.get("Relation Name"))
+            for child in node.get("Plans", []):
+                walk(child)
+
+        walk(plan[0]["Plan"])
+        return tables
+
+    # SQLite: "SCAN t", "SCAN t USING [COVERING] INDEX ix" (full scans) vs "SEARCH t ..."
+    partial = _partial_indexes()
+    tables = set()
+    for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+        words = row[-1].split()
+        if words[0] != "SCAN":
+            continue
+        index = words[words.index("INDEX") + 1] if "INDEX" in words else None
+        if index not in partial:
+            tables.add(words[1])
+    return tables
+
+
+def assert_no_full_scans(statements, allow=()):
+    assert statements, "nothing was executed"
+    failures = []
+    with engine.connect() as conn:
+        sizes = {
+            table.__tablename__: conn.scalar(select(func.count()).select_from(table))
+            for table in (User, LeaveRequest)
+        }
+        for statement, parameters in statements:
+            for table in _full_scans(conn, statement, parameters) - set(allow):
+                if sizes.get(table, 0) > THRESHOLD:
+                    failures.append(f"full scan on {table} ({sizes[table]} rows): {' '.join(statement.split())[:200]}")
+    assert not failures, "\n".join(failures)
+
+
+def test_approvals_inbox_of_supervisor_uses_pending_index(tenant, client_for):
+    client = client_for(tenant["supervisors"][0], DOMAIN)
+    with captured_statements() as statements:
+        assert client.get("/leaves/approvals?limit=50").status_code == 200
+    assert_no_full_scans(statements)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_approvals_inbox_of_admin_scans_only_pending_rows(tenant, client_for, compact):
+    client = client_for(tenant["admin"], DOMAIN)
+    with captured_statements() as statements:
+        assert client.get(f"/leaves/approvals?compact={str(compact).lower()}").status_code == 200
+    # users: the tenant filter is `email LIKE '%@domain'`
+    assert_no_full_scans(statements, allow={"users"})
+
+
+def test_calendar_window(tenant, client_for):
+    client = client_for(tenant["admin"], DOMAIN)
+    with captured_statements() as statements:
+        assert client.get("/leaves/calendar?from=2026-03-01&to=2026-03-31").status_code == 200
+    assert_no_full_scans(statements, allow={"users"})
+
+
+def test_my_requests_page(tenant, client_for):
+    client = client_for(tenant["users"][0], DOMAIN)
+    with captured_statements() as statements:
+        assert client.get("/leaves/me/requests?limit=50").status_code == 200
+    assert_no_full_scans(statements)
+
+
+def test_managed_users_of_supervisor(tenant, client_for):
+    client = client_for(tenant["supervisors"][0], DOMAIN)
+    with captured_statements() as statements:
+        assert client.get("/users/managed").status_code == 200
+    assert_no_full_scans(statements)
+
+
+def test_create_request_overlap_lookup(tenant):
+    db = SessionLocal()
+    try:
+        with captured_statements() as statements:
+            overlaps = _overlaps_user_range(db, tenant["users"][0], date(2026, 1, 5), date(2026, 1, 9))
+            db.execute(select(LeaveRequest.id).where(*overlaps, pending_approval(LeaveRequest.status))).all()
+            db.execute(select(LeaveRequest.start_date, LeaveRequest.end_date).where(*overlaps)).all()
+    finally:
+        db.close()
+    assert_no_full_scans(statements)
+
+
+def test_reassign_pending_approver(tenant):
+    db = SessionLocal()
+    try:
+        with captured_statements() as statements:
+            _reassign_pending_approver(db, tenant["users"][0], tenant["supervisors"][1])
+        db.rollback()
+    finally:
+        db.close()
+    assert_no_full_scans(statements)
@@ -0,0 +1,138 @@
+"""Token buckets (app.rate_limit): storages, and where the limiter sits on /tenants/me/sync."""
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import select
+
+from app import rate_limit
+from app.database import engine
+from app.models import RateLimitBucket
+from app.rate_limit import IDLE_AFTER, PURGE_INTERVAL, DatabaseStorage, MemoryStorage, parse_rate, set_storage
+
+from conftest import seed_tenant
+
+DOMAIN = "limits.example"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Frozen time.time() for app.rate_limit; advance with `clock.now += seconds`."""
+    class Clock:
+        now = 1_000_000.0
+
+    monkeypatch.setattr(rate_limit.time, "time", lambda: Clock.now)
+    return Clock
+
+
+@pytest.fixture
+def memory_storage():
+    storage = MemoryStorage()
+    set_storage(storage)
+    yield storage
+    set_storage(None)
+
+
+def test_parse_rate():
+    assert parse_rate("10/minute") == (10.0, 10 / 60)
+    with pytest.raises(ValueError):
+        parse_rate("10 per minute")
+
+
+def test_memory_storage_refill_and_retry_after(clock):
+    storage = MemoryStorage()
+    capacity, rate = parse_rate("3/minute")  # one token every 20s
+
+    assert [storage.consume("k", capacity, rate)[0] for _ in range(3)] == [True, True, True]
+    assert storage.consume("k", capacity, rate) == (False, pytest.approx(20.0))
+
+    clock.now += 5
+    assert storage.consume("k", capacity, rate) == (False, pytest.approx(15.0))
+
+    clock.now += 15
+    assert storage.consume("k", capacity, rate) == (True, 0.0)
+    assert storage.consume("k", capacity, rate)[0] is False
+
+    # Refill stops at capacity
+    clock.now += 3600
+    assert [storage.consume("k", capacity, rate)[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_database_storage_concurrent_consumers_get_exactly_capacity():
+    storage = DatabaseStorage(engine)
+    key = f"test:{uuid.uuid4()}"
+    capacity, rate = parse_rate("10/day")
+    start = threading.Barrier(40)
+
+    def consume(_):
+        start.wait()
+        return storage.consume(key, capacity, rate)
+
+    with ThreadPoolExecutor(max_workers=40) as pool:
+        results = list(pool.map(consume, range(40)))
+
+    assert sum(allowed for allowed, _ in results) == 10
+    assert all(retry_after > 0 for allowed, retry_after in results if not allowed)
+
+
+def test_database_storage_retry_after(clock):
+    storage = DatabaseStorage(engine)
+    key = f"test:{uuid.uuid4()}"
+    capacity, rate = parse_rate("2/minute")  # one token every 30s
+
+    assert storage.consume(key, capacity, rate) == (True, 0.0)
+    assert storage.consume(key, capacity, rate) == (True, 0.0)
+    assert storage.consume(key, capacity, rate) == (False, pytest.approx(30.0))
+    clock.now += 30
+    assert storage.consume(key, capacity, rate) == (True, 0.0)
+
+
+def _bucket_keys(keys) -> set:
+    with engine.connect() as conn:
+        return set(conn.scalars(select(RateLimitBucket.key).where(RateLimitBucket.key.in_(keys))))
+
+
+def test_database_storage_drops_idle_buckets(clock):
+    storage = DatabaseStorage(engine)
+    idle, active = f"test:{uuid.uuid4()}", f"test:{uuid.uuid4()}"
+    capacity, rate = parse_rate("5/day")
+
+    storage.consume(idle, capacity, rate)
+    clock.now += IDLE_AFTER - PURGE_INTERVAL
+    storage.consume(active, capacity, rate)
+    assert _bucket_keys([idle, active]) == {idle, active}
+
+    # The next consume after PURGE_INTERVAL drops what has been idle a full day
+    clock.now += PURGE_INTERVAL + 1
+    storage.consume(active, capacity, rate)
+    assert _bucket_keys([idle, active]) == {active}
+    # Dropping a full bucket loses nothing: it starts full again
+    assert storage.consume(idle, capacity, rate) == (True, 0.0)
+
+
+def test_memory_storage_drops_idle_buckets(clock):
+    storage = MemoryStorage()
+    capacity, rate = parse_rate("5/day")
+    storage.consume("idle", capacity, rate)
+    clock.now += IDLE_AFTER - PURGE_INTERVAL
+    storage.consume("active", capacity, rate)
+
+    clock.now += PURGE_INTERVAL + 1
+    storage.consume("active", capacity, rate)
+    assert set(storage._buckets) == {"active"}
+
+
+def test_tenant_sync_rejects_non_admins_before_spending_tokens(client_for, memory_storage):
+    ids = seed_tenant(DOMAIN)
+
+    # More than the tenant's 20/hour, all refused by the admin check
+    for user_id in ids["users"]:
+        client = client_for(user_id, DOMAIN)
+        for _ in range(5):
+            assert client.post("/tenants/me/sync").status_code == 403
+
+    # The admin still gets their own 5/minute (400: no shared calendar configured here)
+    admin = client_for(ids["admin"], DOMAIN)
+    statuses = [admin.post("/tenants/me/sync").status_code for _ in range(6)]
+    assert statuses == [400] * 5 + [429]
@@ -0,0 +1,68 @@
+"""POST /leaves/admin/rollover: carry-over cap and idempotency."""
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models import LeaveEntitlement
+
+from conftest import seed_tenant
+
+PREVIOUS, YEAR = 2030, 2031
+
+
+@pytest.fixture
+def tenant(client_for):
+    domain = f"r{uuid.uuid4().hex[:8]}.example"
+    ids = seed_tenant(domain, users=3, leaves_per_user=0)
+    db = SessionLocal()
+    try:
+        # user0 carries 2 days, user1 8 (over the cap), user2 is overdrawn; nobody else has a PREVIOUS entitlement
+        for user_id, remaining in zip(ids["users"], (2.0, 8.0, -1.0)):
+            db.add(LeaveEntitlement(user_id=user_id, year=PREVIOUS, total_days=20, remaining_days=remaining))
+        db.commit()
+    finally:
+        db.close()
+    return {**ids, "domain": domain, "admin_client": client_for(ids["admin"], domain)}
+
+
+def _entitlements(user_ids) -> dict:
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(LeaveEntitlement.user_id, LeaveEntitlement.total_days, LeaveEntitlement.remaining_days)
+            .where(LeaveEntitlement.user_id.in_(user_ids), LeaveEntitlement.year == YEAR)
+        )
+        return {user_id: (total, remaining) for user_id, total, remaining in rows}
+    finally:
+        db.close()
+
+
+def test_carry_over_is_capped(tenant):
+    response = tenant["admin_client"].post(f"/leaves/admin/rollover?year={YEAR}&carry_over_max=5")
+    assert response.status_code == 200
+    assert response.json()["per_tenant"] == {tenant["domain"]: 5}  # admin, supervisor, 3 users
+
+    users = tenant["users"]
+    assert _entitlements([*users, tenant["admin"]]) == {
+        users[0]: (22.0, 22.0),
+        users[1]: (25.0, 25.0),
+        users[2]: (20.0, 20.0),
+        tenant["admin"]: (20.0, 20.0),
+    }
+
+
+def test_second_run_inserts_nothing(tenant):
+    client = tenant["admin_client"]
+    assert client.post(f"/leaves/admin/rollover?year={YEAR}&carry_over_max=5").json()["created"] == 5
+    before = _entitlements(tenant["users"])
+
+    again = client.post(f"/leaves/admin/rollover?year={YEAR}&carry_over_max=10")
+    assert again.status_code == 200
+    assert again.json()["created"] == 0
+    assert _entitlements(tenant["users"]) == before
+
+
+def test_negative_carry_over_max_is_rejected(tenant):
+    assert tenant["admin_client"].post(f"/leaves/admin/rollover?year={YEAR}&carry_over_max=-1").status_code == 422
@@ -1,4 +1,5 @@
 import { apiClient } from "./client";
+import type { User } from "./users";
 
 export interface LeaveRequest {
     id: string;
@@ -23,6 +24,28 @@ export interface LeaveEntitlement {
     remaining_days: number;
 }
 
+export interface TeamBalance {
+    user: User;
+    year: number;
+    entitlement_id?: number | null;
+    total_days: number;
+    remaining_days: number;
+    accrued_days: number;
+    used_days: number;
+    pending_days: number;
+    pending_count: number;
+    next_leave_start?: string | null;
+    next_leave_end?: string | null;
+}
+
+export interface Dashboard {
+    user: User;
+    year: number;
+    entitlement: LeaveEntitlement & { accrued_days: number };
+    requests: LeaveRequest[];
+    pending_approvals: number;
+}
+
 export const leavesApi = {
     getEntitlement: () => apiClient.get<LeaveEntitlement>("/leaves/me/entitlement"),
     
@@ -43,11 +66,20 @@ export const leavesApi = {
     updateAdminEntitlement: (userId: string, data: Partial<LeaveEntitlement>) => 
         apiClient.put<any>(`/leaves/admin/${userId}/entitlement`, data),
 
-    getCalendar: () => apiClient.get<LeaveRequest[]>("/leaves/calendar"),
+    getCalendar: (from?: string, to?: string) =>
+        apiClient.get<LeaveRequest[]>(
+            from && to ? `/leaves/calendar?from=${from}&to=${to}` : "/leaves/calendar"
+        ),
     
     getUserLeaves: (userId: string) => 
         apiClient.get<LeaveRequest[]>(`/leaves/admin/users/${userId}/leaves`),
         
     getUserEntitlement: (userId: string, year: number) => 
-        apiClient.get<LeaveEntitlement>(`/leaves/admin/users/${userId}/entitlement?year=${year}`)
+        apiClient.get<LeaveEntitlement>(`/leaves/admin/users/${userId}/entitlement?year=${year}`),
+
+    getDashboard: (year?: number) =>
+        apiClient.get<Dashboard>(year ? `/me/dashboard?year=${year}` : "/me/dashboard"),
+
+    getTeamBalances: (year: number) =>
+        apiClient.get<TeamBalance[]>(`/leaves/team/balances?year=${year}`)
 };
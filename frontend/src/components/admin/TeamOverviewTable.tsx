@@ -1,7 +1,7 @@
 import { useQuery } from "@tanstack/react-query";
 import { useTranslation } from "react-i18next";
 import { User } from "@/api/users";
-import { leavesApi } from "@/api/leaves";
+import { leavesApi, TeamBalance } from "@/api/leaves";
 import {
     Table,
     TableBody,
@@ -13,7 +13,6 @@ import {
 import { Avatar, AvatarFallback, AvatarImage } from "@/components/ui/avatar";
 import { getAvatarUrl, getInitials } from "@/utils/avatarUrl";
 import { useMemo } from "react";
-import { parseISO } from "date-fns";
 import { Spinner } from "@/components/ui/spinner";
 import { useDateFormatter } from "@/hooks/useDateFormatter";
 import { Clock } from "lucide-react";
@@ -27,6 +26,18 @@ interface TeamOverviewTableProps {
 export function TeamOverviewTable({ users, year, onUserSelect }: TeamOverviewTableProps) {
     const { t } = useTranslation();
 
+    // One aggregated request for the whole team instead of two per row
+    const { data: balances, isLoading } = useQuery({
+        queryKey: ["teamBalances", year],
+        queryFn: () => leavesApi.getTeamBalances(year)
+    });
+
+    const balanceByUser = useMemo(() => {
+        const map = new Map<string, TeamBalance>();
+        balances?.forEach(b => map.set(b.user.id, b));
+        return map;
+    }, [balances]);
+
     const employees = users.filter(u => u.user_type === "employee");
     const contractors = users.filter(u => u.user_type === "contractor");
 
@@ -51,7 +62,8 @@ export function TeamOverviewTable({ users, year, onUserSelect }: TeamOverviewTab
                                     <EmployeeRow 
                                         key={user.id} 
                                         user={user} 
-                                        year={year} 
+                                        balance={balanceByUser.get(user.id)}
+                                        isLoading={isLoading}
                                         onClick={() => onUserSelect(user.id)}
                                     />
                                 ))}
@@ -79,7 +91,8 @@ export function TeamOverviewTable({ users, year, onUserSelect }: TeamOverviewTab
                                     <ContractorRow 
                                         key={user.id} 
                                         user={user} 
-                                        year={year}
+                                        balance={balanceByUser.get(user.id)}
+                                        isLoading={isLoading}
                                         onClick={() => onUserSelect(user.id)}
                                     />
                                 ))}
@@ -92,44 +105,19 @@ export function TeamOverviewTable({ users, year, onUserSelect }: TeamOverviewTab
     );
 }
 
-function EmployeeRow({ user, year, onClick }: { user: User, year: number, onClick: () => void }) {
+interface RowProps {
+    user: User;
+    balance?: TeamBalance;
+    isLoading: boolean;
+    onClick: () => void;
+}
+
+function EmployeeRow({ user, balance, isLoading, onClick }: RowProps) {
     const { formatDateRange } = useDateFormatter();
     const { t, i18n } = useTranslation();
 
-    const { data: leaves, isLoading: loadingLeaves } = useQuery({
-        queryKey: ["userLeaves", user.id],
-        queryFn: () => leavesApi.getUserLeaves(user.id)
-    });
-
-    const { data: entitlement, isLoading: loadingEntitlement } = useQuery({
-        queryKey: ["userEntitlement", user.id, year],
-        queryFn: () => leavesApi.getUserEntitlement(user.id, year)
-    });
-
-    const usedOrPlanned = useMemo(() => {
-        return leaves?.filter(req => new Date(req.start_date).getFullYear() === year)
-            .reduce((sum, req) => {
-                if (['approved', 'pending', 'cancel_pending'].includes(req.status)) {
-                    return sum + req.days_count;
-                }
-                return sum;
-            }, 0) || 0;
-    }, [leaves, year]);
-
-    const nextAbsence = useMemo(() => {
-        const today = new Date();
-        today.setHours(0, 0, 0, 0);
-        return leaves
-            ?.filter(r => ["approved", "pending"].includes(r.status))
-            .filter(r => parseISO(r.start_date) >= today)
-            .sort((a, b) => parseISO(a.start_date).getTime() - parseISO(b.start_date).getTime())[0];
-    }, [leaves]);
-
-    const pendingCount = useMemo(() => {
-        return leaves?.filter(r => r.status === "pending").length || 0;
-    }, [leaves]);
-
-    const isLoading = loadingLeaves || loadingEntitlement;
+    const usedOrPlanned = (balance?.used_days ?? 0) + (balance?.pending_days ?? 0);
+    const pendingCount = balance?.pending_count ?? 0;
 
     return (
         <TableRow onClick={onClick} className="cursor-pointer hover:bg-muted/5 transition-colors border-muted/10">
@@ -154,10 +142,10 @@ function EmployeeRow({ user, year, onClick }: { user: User, year: number, onClic
             </TableCell>
             <TableCell className="text-center text-sm">
                 {isLoading ? <Spinner size="sm" className="mx-auto" /> : (
-                     nextAbsence ? (
+                     balance?.next_leave_start && balance?.next_leave_end ? (
                         <div className="flex items-center justify-center gap-1.5 text-emerald-600 dark:text-emerald-400 font-medium">
                             <Clock className="h-3.5 w-3.5" />
-                            {formatDateRange(nextAbsence.start_date, nextAbsence.end_date)}
+                            {formatDateRange(balance.next_leave_start, balance.next_leave_end)}
                         </div>
                     ) : (
                         <span className="text-muted-foreground/40 text-xs">-</span>
@@ -178,9 +166,9 @@ function EmployeeRow({ user, year, onClick }: { user: User, year: number, onClic
             <TableCell className="text-right">
                 {isLoading ? <Spinner size="sm" className="ml-auto" /> : (
                     <div className="font-medium">
-                         <span className="text-blue-600 dark:text-blue-400">{entitlement?.accrued_days?.toLocaleString(i18n.language) ?? "-"}</span>
+                         <span className="text-blue-600 dark:text-blue-400">{balance?.accrued_days?.toLocaleString(i18n.language) ?? "-"}</span>
                          <span className="text-muted-foreground/40 font-light mx-2">/</span>
-                         <span className="text-foreground">{entitlement?.total_days?.toLocaleString(i18n.language) ?? "-"}</span>
+                         <span className="text-foreground">{balance?.total_days?.toLocaleString(i18n.language) ?? "-"}</span>
                     </div>
                 )}
             </TableCell>
@@ -188,38 +176,12 @@ function EmployeeRow({ user, year, onClick }: { user: User, year: number, onClic
     );
 }
 
-function ContractorRow({ user, year, onClick }: { user: User, year: number, onClick: () => void }) {
+function ContractorRow({ user, balance, isLoading, onClick }: RowProps) {
     const { formatDateRange } = useDateFormatter();
     const { t, i18n } = useTranslation();
 
-    const { data: leaves, isLoading } = useQuery({
-        queryKey: ["userLeaves", user.id],
-        queryFn: () => leavesApi.getUserLeaves(user.id)
-    });
-
-    const usedOrPlanned = useMemo(() => {
-        return leaves?.filter(req => new Date(req.start_date).getFullYear() === year)
-            .reduce((sum, req) => {
-                if (['approved', 'pending', 'cancel_pending'].includes(req.status)) {
-                    return sum + req.days_count;
-                }
-                return sum;
-            }, 0) || 0;
-    }, [leaves, year]);
-
-    const nextAbsence = useMemo(() => {
-        const today = new Date();
-        today.setHours(0, 0, 0, 0);
-        return leaves
-            ?.filter(r => ["approved", "pending"].includes(r.status))
-            .filter(r => parseISO(r.start_date) >= today)
-            .sort((a, b) => parseISO(a.start_date).getTime() - parseISO(b.start_date).getTime())[0];
-    }, [leaves]);
-
-    const pendingCount = useMemo(() => {
-        return leaves?.filter(r => r.status === "pending").length || 0;
-    }, [leaves]);
-
+    const usedOrPlanned = (balance?.used_days ?? 0) + (balance?.pending_days ?? 0);
+    const pendingCount = balance?.pending_count ?? 0;
 
     return (
         <TableRow onClick={onClick} className="cursor-pointer hover:bg-muted/5 transition-colors border-muted/10">
@@ -244,10 +206,10 @@ function ContractorRow({ user, year, onClick }: { user: User, year: number, onCl
             </TableCell>
             <TableCell className="text-center text-sm">
                  {isLoading ? <Spinner size="sm" className="mx-auto" /> : (
-                     nextAbsence ? (
+                     balance?.next_leave_start && balance?.next_leave_end ? (
                         <div className="flex items-center justify-center gap-1.5 text-emerald-600 dark:text-emerald-400 font-medium">
                             <Clock className="h-3.5 w-3.5" />
-                            {formatDateRange(nextAbsence.start_date, nextAbsence.end_date)}
+                            {formatDateRange(balance.next_leave_start, balance.next_leave_end)}
                         </div>
                     ) : (
                         <span className="text-muted-foreground/40 text-xs">-</span>
@@ -56,7 +56,9 @@ export function RequestLeaveSheet({ open, onOpenChange, onSuccess, entitlement,
           });
           if (!res.ok) throw new Error("Failed");
           return res.json();
-      }
+      },
+      // Only needed to mark booked days in the picker; don't fetch with the page
+      enabled: open
   });
 
   const isDayInRequests = (date: Date, statuses: string[]) => {
@@ -1,5 +1,5 @@
 import { useState } from "react";
-import { useQuery } from "@tanstack/react-query";
+import { useQuery, keepPreviousData } from "@tanstack/react-query";
 import { 
   format, 
   addMonths, 
@@ -43,11 +43,6 @@ export function CalendarPage() {
     const [currentDate, setCurrentDate] = useState(new Date());
     const locale = i18n.language === "cs" ? cs : enUS;
 
-    const { data: requests, isLoading } = useQuery({
-        queryKey: ["teamCalendar"],
-        queryFn: () => leavesApi.getCalendar()
-    });
-
     const nextMonth = () => setCurrentDate(addMonths(currentDate, 1));
     const prevMonth = () => setCurrentDate(subMonths(currentDate, 1));
 
@@ -56,6 +51,16 @@ export function CalendarPage() {
     const startDate = startOfWeek(monthStart, { weekStartsOn: 1 });
     const endDate = endOfWeek(monthEnd, { weekStartsOn: 1 });
 
+    // Only fetch leaves overlapping the visible grid
+    const windowFrom = format(startDate, "yyyy-MM-dd");
+    const windowTo = format(endDate, "yyyy-MM-dd");
+
+    const { data: requests, isLoading } = useQuery({
+        queryKey: ["teamCalendar", windowFrom, windowTo],
+        queryFn: () => leavesApi.getCalendar(windowFrom, windowTo),
+        placeholderData: keepPreviousData
+    });
+
     const calendarDays = eachDayOfInterval({ start: startDate, end: endDate });
 
     const getInitials = (name?: string | null, email?: string) => {
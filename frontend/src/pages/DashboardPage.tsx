@@ -10,6 +10,7 @@ import { Badge } from "@/components/ui/badge";
 import { Spinner } from "@/components/ui/spinner";
 import { useToast } from "@/hooks/use-toast";
 import { RequestLeaveSheet } from "@/components/leaves/RequestLeaveSheet";
+import { leavesApi } from "@/api/leaves";
 import {
   AlertDialog,
   AlertDialogAction,
@@ -21,24 +22,6 @@ import {
   AlertDialogTitle,
 } from "@/components/ui/alert-dialog";
 
-const fetchEntitlement = async (year: number) => {
-  const token = localStorage.getItem("token");
-  const res = await fetch(`/api/leaves/me/entitlement?year=${year}`, {
-     headers: { Authorization: `Bearer ${token}` }
-  });
-  if (!res.ok) throw new Error("Failed");
-  return res.json();
-}
-
-const fetchRequests = async () => {
-  const token = localStorage.getItem("token");
-  const res = await fetch("/api/leaves/me/requests", {
-     headers: { Authorization: `Bearer ${token}` }
-  });
-  if (!res.ok) throw new Error("Failed");
-  return res.json();
-}
-
 const getCzechDaysLabel = (count: number) => {
     if (count === 1) return "den";
     if (count === 0.5) return "dne";
@@ -58,32 +41,35 @@ export function DashboardPage() {
 
   const queryClient = useQueryClient();
   
-  // Load current user for user_type and admin status
-  const { data: currentUser } = useQuery<CurrentUser, Error>({
-    queryKey: ["currentUser"],
-    queryFn: () => authApi.me(),
-  });
+  const currentYear = new Date().getFullYear();
+  const nextYear = currentYear + 1;
+  const isFutureYear = selectedYear > currentYear;
 
-  // Load ALL requests to determine if we have future ones
-  const { data: allRequests, isLoading: loadingRequests } = useQuery({
-    queryKey: ["my-requests"],
-    queryFn: fetchRequests
+  // One round trip: user, entitlement, requests from the year on and the approvals count.
+  // The current-year dashboard also carries next-year requests (year switch, upcoming leave).
+  const { data: dashboard, isLoading: loadingDashboard } = useQuery({
+    queryKey: ["dashboard", currentYear],
+    queryFn: () => leavesApi.getDashboard(currentYear)
   });
 
-  const { data: entitlement, isLoading: loadingEntitlement } = useQuery({
-    queryKey: ["entitlement", selectedYear],
-    queryFn: () => fetchEntitlement(selectedYear)
+  // Entitlement of another year only when that year is selected
+  const { data: selectedDashboard, isLoading: loadingSelected } = useQuery({
+    queryKey: ["dashboard", selectedYear],
+    queryFn: () => leavesApi.getDashboard(selectedYear),
+    enabled: selectedYear !== currentYear
   });
 
+  const currentUser = dashboard?.user;
+  const allRequests = dashboard?.requests;
+  const entitlement = selectedYear === currentYear ? dashboard?.entitlement : selectedDashboard?.entitlement;
+  const loadingRequests = loadingDashboard;
+  const loadingEntitlement = selectedYear === currentYear ? loadingDashboard : loadingSelected;
+
   const handleSuccess = () => {
-    queryClient.invalidateQueries({ queryKey: ["entitlement"] });
+    queryClient.invalidateQueries({ queryKey: ["dashboard"] });
     queryClient.invalidateQueries({ queryKey: ["my-requests"] });
   };
 
-  const currentYear = new Date().getFullYear();
-  const nextYear = currentYear + 1;
-  const isFutureYear = selectedYear > currentYear;
-
   // Filter requests for display
   const displayedRequests = allRequests?.filter((req: any) => new Date(req.start_date).getFullYear() === selectedYear);
   